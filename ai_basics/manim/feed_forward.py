@@ -0,0 +1,59 @@
+# feed_forward.py
+import os
+import numpy as np
+
+# A tiny NumPy multilayer perceptron that runs a whole dataset through the
+# network in one batched pass, for scenes that show predictions at scale.
+
+
+def load_dataset(source):
+    """
+    Returns an (n, 2) array of (x, y) rows from an array or the path of a
+    .npy file. Files are memory-mapped rather than read into RAM up front.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        data = np.load(source, mmap_mode="r")
+    else:
+        data = np.asarray(source, dtype=float)
+    if data.ndim != 2 or data.shape[1] != 2:
+        raise ValueError(f"expected an (n, 2) array of (x, y) rows, got shape {data.shape}")
+    return data
+
+
+def init_weights(layer_sizes, seed=0):
+    """Random (untrained) weights and biases, one (W, b) pair per layer."""
+    rng = np.random.default_rng(seed)
+    return [
+        (rng.normal(0, 1 / np.sqrt(n_in), size=(n_in, n_out)), rng.normal(0, 0.5, size=n_out))
+        for n_in, n_out in zip(layer_sizes, layer_sizes[1:])
+    ]
+
+
+def feed_forward(inputs, weights, activation=np.tanh):
+    """Runs every row of ``inputs`` through the network at once. The output layer is linear."""
+    out = np.asarray(inputs, dtype=float)
+    for k, (W, b) in enumerate(weights):
+        out = out @ W + b
+        if k < len(weights) - 1:
+            out = activation(out)
+    return out
+
+
+def predict(x, y, weights):
+    """
+    Predicts y from x with a network that takes the two inputs (x, x^2).
+    x is standardized on the way in and the output is scaled back to y's units.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x_scaled = (x - x.mean()) / (x.std() or 1.0)
+    features = np.stack([x_scaled, x_scaled**2], axis=-1)
+    return y.mean() + (y.std() or 1.0) * feed_forward(features, weights)[:, 0]
+
+
+def padded_range(*arrays, ticks=6):
+    """An [low, high, step] axis range covering every value in ``arrays`` with a small margin."""
+    low = min(float(np.min(a)) for a in arrays)
+    high = max(float(np.max(a)) for a in arrays)
+    pad = 0.05 * (high - low) or 1.0
+    return [low - pad, high + pad, (high - low + 2 * pad) / ticks]
@@ -0,0 +1,56 @@
+# particle_descent.py
+from manim import *
+import numpy as np
+
+# Gradient descent for many starting points at once. All particles advance
+# together with NumPy array operations, and are drawn as one point cloud.
+
+
+def numerical_gradient(func, u, v, h=1e-4):
+    """Central-difference gradient of a vectorized func at every (u, v) at once."""
+    du = (func(u + h, v) - func(u - h, v)) / (2 * h)
+    dv = (func(u, v + h) - func(u, v - h)) / (2 * h)
+    return du, dv
+
+
+def descent_trajectories(func, starts, learning_rate=0.05, steps=60, bounds=None):
+    """
+    Runs ``steps`` gradient-descent updates from every row of ``starts``
+    (shape (n, 2)) and returns the (steps + 1, n, 3) tensor of
+    (u, v, func(u, v)) positions. ``bounds`` = (low, high) keeps the
+    particles on the plotted part of the surface.
+    """
+    u = np.array(starts[:, 0], dtype=float)
+    v = np.array(starts[:, 1], dtype=float)
+    trajectory = np.empty((steps + 1, len(u), 3))
+    for step in range(steps + 1):
+        trajectory[step] = np.stack([u, v, func(u, v)], axis=-1)
+        if step == steps:
+            break
+        du, dv = numerical_gradient(func, u, v)
+        u = u - learning_rate * du
+        v = v - learning_rate * dv
+        if bounds is not None:
+            u = np.clip(u, *bounds)
+            v = np.clip(v, *bounds)
+    return trajectory
+
+
+class ParticleCloud(PMobject):
+    """
+    Every particle of a batched descent as a single point cloud mobject.
+    ``trajectory`` holds scene points with shape (steps + 1, n, 3);
+    set_step() moves all particles at once, interpolating between steps.
+    """
+    def __init__(self, trajectory, color=RED, stroke_width=4, **kwargs):
+        super().__init__(stroke_width=stroke_width, **kwargs)
+        self.trajectory = trajectory
+        self.add_points(trajectory[0], color=color)
+
+    def set_step(self, step):
+        last = len(self.trajectory) - 1
+        step = min(max(step, 0), last)
+        i = min(int(step), max(last - 1, 0))
+        alpha = step - i
+        self.points = (1 - alpha) * self.trajectory[i] + alpha * self.trajectory[min(i + 1, last)]
+        return self
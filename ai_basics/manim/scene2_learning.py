@@ -1,10 +1,29 @@
 from manim import *
 import numpy as np
 
+# The shared components (components.py, network_diagram.py) live at the repository root:
+# render from there with render_all.py or `python -m manim`, which put it on the import path
+from components import network
+from feed_forward import init_weights, load_dataset, padded_range, predict
+from network_diagram import Segments
+from particle_descent import ParticleCloud, descent_trajectories
+from surface_mesh import VectorizedSurface, axes_to_scene
+
 # This is the full code for Scene 2, Part A
 
 class FeedForwardScene(Scene):
+    # An (n, 2) array of (x, y) rows or the path of a .npy file. When set,
+    # the whole dataset goes through a small NumPy model in one batched
+    # pass and is revealed in reveal_batches plays, however many rows it has.
+    dataset = None
+    reveal_batches = 5
+    model_seed = 0
+
     def construct(self):
+        if self.dataset is not None:
+            self.construct_batched(load_dataset(self.dataset))
+            return
+
         title = Text("Scene 2A: The Feed-Forward Pass").to_edge(UP)
         axes = Axes(x_range=[0, 6, 1], y_range=[0, 6, 1], x_length=5, y_length=5)
         
@@ -14,25 +33,16 @@ class FeedForwardScene(Scene):
 
         data_points = VGroup(*[Dot(axes.c2p(x, y), color=GREEN) for x, y in data_coords])
         data_label = Text("Our Data").next_to(axes, UP)
-        data_group = VGroup(axes, data_points, data_label).to_edge(LEFT)
+        # Group, not VGroup: the point cloud is not a VMobject
+        data_group = Group(axes, data_points, data_label).to_edge(LEFT)
 
-        nn = VGroup(
-            VGroup(*[Circle(radius=0.3) for _ in range(2)]).arrange(DOWN, buff=0.75),
-            VGroup(*[Circle(radius=0.3) for _ in range(4)]).arrange(DOWN, buff=0.5),
-            Circle(radius=0.3)
-        ).arrange(RIGHT, buff=1.5).center()
-        
-        lines = VGroup()
-        for i in range(len(nn) - 1):
-            for n1 in nn[i]:
-                for n2 in nn[i+1]:
-                    lines.add(Line(n1.get_right(), n2.get_left(), stroke_width=1.5, color=GREY))
+        nn = network([2, 4, 1], edge_color=GREY, edge_width=1.5).center()
 
         # --- ANIMATION (Using multiple self.play calls) ---
         self.play(Write(title))
         self.play(Create(data_group))
-        self.play(Create(nn))
-        self.play(Create(lines))
+        self.play(Create(nn.nodes))
+        self.play(Create(nn.edges))
         self.wait(1)
 
         # Animate each data point feeding forward in a simple loop
@@ -42,7 +52,7 @@ class FeedForwardScene(Scene):
             
             prediction_dot = Dot(axes.c2p(x_pred, y_pred), color=RED, radius=0.08)
             error_line = DashedLine(axes.c2p(x_data, y_data), axes.c2p(x_pred, y_pred), stroke_width=2, color=RED)
-            flash_anim = ShowPassingFlash(lines.copy().set_color(YELLOW), time_width=0.5)
+            flash_anim = nn.flash(color=YELLOW, time_width=0.5)
 
             self.play(AnimationGroup(
                 flash_anim,
@@ -54,9 +64,57 @@ class FeedForwardScene(Scene):
         self.play(Write(Text("High Initial Loss!", color=RED).next_to(data_group, RIGHT, buff=0.5)))
         self.wait(3)
 
+    def construct_batched(self, data):
+        """Feeds every row of ``data`` forward at once and reveals the results in a few plays."""
+        title = Text("Scene 2A: The Feed-Forward Pass").to_edge(UP)
+        x, y = np.asarray(data[:, 0], dtype=float), np.asarray(data[:, 1], dtype=float)
+        # One batched pass through an untrained 2-4-1 network
+        y_pred = predict(x, y, init_weights([2, 4, 1], self.model_seed))
+
+        axes = Axes(x_range=padded_range(x), y_range=padded_range(y, y_pred), x_length=5, y_length=5)
+        data_points = PMobject(stroke_width=2)
+        data_label = Text("Our Data").next_to(axes, UP)
+        # Group, not VGroup: the point cloud is not a VMobject
+        data_group = Group(axes, data_points, data_label).to_edge(LEFT)
+        # Added after the move so that c2p already sees the final axes position
+        data_xy = axes.c2p(np.stack([x, y], axis=-1))
+        pred_xy = axes.c2p(np.stack([x, y_pred], axis=-1))
+        data_points.add_points(data_xy, color=GREEN)
+
+        nn = network([2, 4, 1], edge_color=GREY, edge_width=1.5).center()
+
+        self.play(Write(title))
+        self.play(Create(axes), Write(data_label), FadeIn(data_points))
+        self.play(Create(nn.nodes))
+        self.play(Create(nn.edges))
+        self.wait(1)
+
+        # Each batch is one point cloud and one set of residual lines, so the
+        # number of mobjects and plays does not depend on the dataset size
+        for rows in np.array_split(np.arange(len(x)), self.reveal_batches):
+            predictions = PMobject(stroke_width=2).add_points(pred_xy[rows], color=RED)
+            residuals = Segments(data_xy[rows], pred_xy[rows], stroke_width=1, stroke_opacity=0.5, color=RED)
+            self.play(nn.flash(color=YELLOW, time_width=0.5), FadeIn(predictions), Create(residuals), run_time=0.5)
+
+        mse = np.mean((y_pred - y) ** 2)
+        self.wait(1)
+        self.play(Write(Text(f"High Initial Loss! (MSE {mse:.2f})", color=RED, font_size=36).next_to(data_group, RIGHT, buff=0.5)))
+        self.wait(3)
+
 # This is the full code for Scene 2, Part B
 
-class GradientDescentScene(Scene):
+class GradientDescentScene(ThreeDScene):
+    # Faces per side of the loss surface. The mesh is evaluated in one NumPy
+    # call and cached on disk, so raising this for 1080p/4K output is cheap.
+    surface_resolution = 32
+
+    # Batched descent shown after the single ball. Every particle moves in
+    # the same array update and is drawn by one point cloud, so the frame
+    # cost barely changes with the particle count.
+    num_particles = 500
+    descent_steps = 60
+    learning_rate = 0.05
+
     def construct(self):
         title = Text("Scene 2B: Minimizing Loss with Gradient Descent").to_edge(UP)
 
@@ -66,9 +124,11 @@ class GradientDescentScene(Scene):
         def loss_func(u, v):
             return 1.5 + (u**2 + v**2) * (1 + 0.5 * np.sin(2 * PI * u)) / (1 + 0.1 * (u**2 + v**2))
 
-        loss_surface = Surface(
-            lambda u, v: loss_func(u,v),
-            u_range=[-2, 2], v_range=[-2, 2], resolution=(32, 32),
+        # loss_func only uses NumPy operations, so it evaluates the whole (u, v) grid at once
+        loss_surface = VectorizedSurface(
+            lambda u, v: (u, v, loss_func(u, v)),
+            u_range=[-2, 2], v_range=[-2, 2], resolution=self.surface_resolution,
+            axes=axes,
             fill_opacity=0.7,
             checkerboard_colors=[BLUE_D, BLUE_E]
         )
@@ -102,39 +162,51 @@ class GradientDescentScene(Scene):
         # Second descent into the global minimum
         self.play(MoveAlongPath(ball, ArcBetweenPoints(ball.get_center(), global_min_point)), run_time=2.5)
         self.wait(0.5)
-        self.play(Write(Text("Global Minimum", font_size=36).next_to(ball, UP)))
+        global_label = Text("Global Minimum", font_size=36).next_to(ball, UP)
+        self.play(Write(global_label))
+        self.wait(3)
+
+        # Many starting points at once: where each one ends up shows the basins of attraction
+        starts = np.random.default_rng(0).uniform(-2, 2, size=(self.num_particles, 2))
+        trajectory = descent_trajectories(loss_func, starts, self.learning_rate, self.descent_steps, bounds=(-2, 2))
+        particles = ParticleCloud(axes_to_scene(axes, trajectory))
+        step = ValueTracker(0)
+        particles.add_updater(lambda m: m.set_step(step.get_value()))
+
+        self.play(FadeOut(ball), FadeOut(global_label), FadeIn(particles))
+        self.play(step.animate.set_value(self.descent_steps), run_time=4, rate_func=linear)
         self.wait(3)
 
 # This is the full code for Scene 2, Part C
 
 class BackpropagationScene(Scene):
+    # Any three layer sizes work; wide layers are squeezed to fit the frame
+    layer_sizes = [2, 4, 1]
+
     def construct(self):
         title = Text("Scene 2C: How We Learn - Backpropagation").to_edge(UP)
 
-        nn = VGroup(
-            VGroup(*[Circle(radius=0.3) for _ in range(2)]).arrange(DOWN, buff=0.75),
-            VGroup(*[Circle(radius=0.3) for _ in range(4)]).arrange(DOWN, buff=0.5),
-            Circle(radius=0.3)
-        ).arrange(RIGHT, buff=1.5).center()
-        lines1 = VGroup(*[Line(n1.get_right(), n2.get_left()) for n1 in nn[0] for n2 in nn[1]])
-        lines2 = VGroup(*[Line(n1.get_right(), n2.get_left()) for n1 in nn[1] for n2 in nn[2]])
+        nn = network(self.layer_sizes, edge_color=WHITE, edge_width=DEFAULT_STROKE_WIDTH).center()
+        lines1 = nn.edge_layer == 0
+        lines2 = nn.edge_layer == 1
         
-        error_text = MathTex("\\text{error} = \\hat{y} - y", color=RED).next_to(nn[2], RIGHT)
+        # The single output node sits on the diagram's vertical centre
+        error_text = MathTex("\\text{error} = \\hat{y} - y", color=RED).next_to(nn, RIGHT)
         
         self.play(Write(title))
-        self.play(Create(nn), Create(VGroup(lines1, lines2)))
+        self.play(Create(nn.nodes), Create(nn.edges))
         self.wait(1)
         
         self.play(Write(error_text))
         
         # Animate backward pass from output to hidden
-        self.play(ShowPassingFlash(lines2.copy().set_color(RED).reverse_direction(), time_width=0.7))
-        self.play(Indicate(lines2, color=RED))
+        self.play(nn.flash(lines2, color=RED, time_width=0.7, reverse=True))
+        self.play(nn.highlight(lines2, color=RED))
         self.wait(0.5)
 
         # Animate backward pass from hidden to input
-        self.play(ShowPassingFlash(lines1.copy().set_color(RED).reverse_direction(), time_width=0.7))
-        self.play(Indicate(lines1, color=RED))
+        self.play(nn.flash(lines1, color=RED, time_width=0.7, reverse=True))
+        self.play(nn.highlight(lines1, color=RED))
         self.wait(2)
         
         self.play(Write(Text("Weights are updated!", font_size=36).next_to(nn, DOWN)))
@@ -0,0 +1,124 @@
+# surface_mesh.py
+from manim import *
+import hashlib
+import inspect
+import os
+import numpy as np
+from manim.mobject.opengl.opengl_surface import OpenGLSurface
+
+# Surfaces evaluated with one NumPy call over the whole (u, v) grid instead
+# of one Python call per vertex. The resulting meshes are cached on disk.
+
+# The arrays of a mesh; OpenGL surfaces derive their normals from the nudged points
+MESH_ARRAYS = ("points", "du_points", "dv_points")
+
+
+def _source_key(func, seen=None):
+    """Source of ``func`` plus the functions and constants it refers to."""
+    seen = set() if seen is None else seen
+    if func in seen:
+        return ""
+    seen.add(func)
+
+    try:
+        parts = [inspect.getsource(func)]
+    except (OSError, TypeError):
+        parts = [repr(func.__code__.co_code)]
+
+    references = [func.__globals__.get(name) for name in func.__code__.co_names]
+    references += [cell.cell_contents for cell in func.__closure__ or ()]
+    for reference in references:
+        if inspect.isfunction(reference):
+            parts.append(_source_key(reference, seen))
+        elif isinstance(reference, (int, float, str, tuple)):
+            parts.append(repr(reference))
+    return "\n".join(parts)
+
+
+def axes_to_scene(axes, coords):
+    """Maps an array of axes coordinates (..., 3) into scene points in one step."""
+    # Axes are affine, so the origin and three unit points describe the whole mapping
+    origin = axes.c2p(0, 0, 0)
+    basis = np.array([axes.c2p(*row) for row in np.eye(3)]) - origin
+    return coords @ basis + origin
+
+
+def _evaluate(func, u, v):
+    """Calls ``func`` once on grid arrays and stacks its (x, y, z) result."""
+    return np.stack(np.broadcast_arrays(*func(u, v)), axis=-1).astype(float)
+
+
+def surface_mesh(func, u_range, v_range, resolution, epsilon=1e-5):
+    """
+    Samples a surface on a (nu, nv) grid and returns a dict of arrays:
+    ``points`` and the ``du_points`` and ``dv_points`` nudged by
+    ``epsilon`` (what OpenGL surfaces store instead of normals).
+
+    ``func(u, v)`` receives the whole grid as 2D arrays and returns the
+    x, y and z coordinates. The mesh is cached under the media folder,
+    keyed by the source of ``func`` (and of the functions it calls), the
+    ranges and the resolution.
+    """
+    nu, nv = resolution if isinstance(resolution, (tuple, list)) else (resolution, resolution)
+    key = repr((_source_key(func), tuple(u_range), tuple(v_range), nu, nv, epsilon, MESH_ARRAYS))
+    cache_file = config.get_dir("media_dir") / "surface_meshes" / (hashlib.sha256(key.encode()).hexdigest() + ".npz")
+    if cache_file.is_file():
+        with np.load(cache_file) as data:
+            return {name: data[name] for name in MESH_ARRAYS}
+
+    u, v = np.meshgrid(np.linspace(*u_range, nu), np.linspace(*v_range, nv), indexing="ij")
+    points = _evaluate(func, u, v)
+    du_points = _evaluate(func, u + epsilon, v)
+    dv_points = _evaluate(func, u, v + epsilon)
+    mesh = dict(points=points, du_points=du_points, dv_points=dv_points)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp.npz")
+    np.savez(tmp, **mesh)
+    tmp.replace(cache_file)
+    return mesh
+
+
+class VectorizedSurface(Surface):
+    """
+    A Surface built from surface_mesh() rather than calling ``func`` per vertex.
+
+    ``func(u, v)`` takes arrays and returns (x, y, z) arrays. When ``axes``
+    is given, those are treated as axes coordinates and mapped into the
+    scene. Works with both renderers; with OpenGL this becomes an
+    OpenGLSurface and ``resolution`` counts samples instead of faces.
+    """
+    def __init__(self, func, u_range=(0, 1), v_range=(0, 1), resolution=32, axes=None, **kwargs):
+        opengl = isinstance(self, OpenGLSurface)
+        nu, nv = resolution if isinstance(resolution, (tuple, list)) else (resolution, resolution)
+        # Cairo faces sit between samples, so they need one more sample per side
+        samples = (nu, nv) if opengl else (nu + 1, nv + 1)
+        mesh = surface_mesh(func, u_range, v_range, samples)
+
+        if axes is not None:
+            mesh = {name: axes_to_scene(axes, array) for name, array in mesh.items()}
+        self.mesh = mesh
+        # Surface.__init__ maps the faces through func one point at a time; they are already in place
+        self._mesh_applied = opengl
+
+        super().__init__(func, u_range=u_range, v_range=v_range, resolution=(nu, nv), **kwargs)
+
+    def _setup_in_uv_space(self):
+        super()._setup_in_uv_space()
+        points = self.mesh["points"]
+        for face in self:
+            i, j = face.u_index, face.v_index
+            face.set_points_as_corners([
+                points[i, j], points[i + 1, j], points[i + 1, j + 1], points[i, j + 1], points[i, j],
+            ])
+
+    def apply_function(self, function, **kwargs):
+        if not self._mesh_applied:
+            self._mesh_applied = True
+            return self
+        return super().apply_function(function, **kwargs)
+
+    def init_points(self):
+        self.set_points(np.vstack([
+            self.mesh[name].reshape(-1, 3) for name in MESH_ARRAYS
+        ]))
@@ -2,17 +2,42 @@
 from manim import *
 
 class SingleNeuronProcess(Scene):
+    # Total duration the whole sequence is stretched over (timeline.py can seek within it)
+    run_time = 20
+
+    # --- CONFIGURATION --- (variant_batch.py renders other values)
+    x_val = 0.8
+    w_val = 0.7
+    b_val = -0.4
+
+    # Neuron, axes and sigmoid by renderer; they do not depend on the values,
+    # so variant_batch.py builds them once and forks every variant from there
+    _shared = {}
+
+    @classmethod
+    def shared_setup(cls):
+        """Returns copies of the neuron, axes, sigmoid graph and its label, building them once per process."""
+        key = str(config.renderer)
+        if key not in cls._shared:
+            neuron = Circle(radius=1.2, color=BLUE, fill_opacity=0.2)
+            axes = Axes(x_range=[-4, 4, 1], y_range=[-0.1, 1.1, 0.2])
+            axes.set(height=5.5, width=6.5).to_edge(RIGHT, buff=1)
+            sigmoid_graph = axes.plot(lambda x: 1 / (1 + np.exp(-x)), color=GREEN)
+            graph_label = Text("Activation Function").next_to(axes, UP, buff=0.2)
+            cls._shared[key] = (neuron, axes, sigmoid_graph, graph_label)
+        return [mobject.copy() for mobject in cls._shared[key]]
+
     def construct(self):
-        # --- CONFIGURATION ---
-        x_val = 0.8
-        w_val = 0.7
-        b_val = -0.4
+        self.play(self.build_animation(), run_time=self.run_time)
+
+    def build_animation(self):
+        x_val, w_val, b_val = self.x_val, self.w_val, self.b_val
+        neuron, axes, sigmoid_graph, graph_label = self.shared_setup()
 
         # --- PART 1: LINEAR CALCULATION ---
 
         # 1. Define all mobjects up front
         x_text = MathTex("x = {{%.1f}}" % x_val).to_edge(LEFT, buff=1.5)
-        neuron = Circle(radius=1.2, color=BLUE, fill_opacity=0.2)
         neuron_group = VGroup(neuron).center()
 
         line = Line(x_text.get_right(), neuron.get_left())
@@ -27,17 +52,12 @@ class SingleNeuronProcess(Scene):
         bias_anim_text = bias_text.copy()
 
         # Create the sum expression for inside the neuron
-        sum_expression = MathTex("0.56", "+", "(-0.4)").move_to(neuron).scale(0.8)
+        sum_expression = MathTex(f"{prod_val:.2f}", "+", f"({b_val})").move_to(neuron).scale(0.8)
         
         z_val = prod_val + b_val
         z_result = MathTex(f"z = {z_val:.2f}", color=YELLOW).move_to(neuron)
         
         # --- PART 2: ACTIVATION ---
-        
-        axes = Axes(x_range=[-4, 4, 1], y_range=[-0.1, 1.1, 0.2])
-        axes.set(height=5.5, width=6.5).to_edge(RIGHT, buff=1)
-        sigmoid_graph = axes.plot(lambda x: 1 / (1 + np.exp(-x)), color=GREEN)
-        graph_label = Text("Activation Function").next_to(axes, UP, buff=0.2)
 
         output_val = sigmoid_graph.underlying_function(z_val)
         z_point = axes.c2p(z_val, 0)
@@ -48,55 +68,65 @@ class SingleNeuronProcess(Scene):
         h_line = DashedLine(y_graph_point, y_axis_point, color=YELLOW)
         final_output_text = MathTex(f"\\hat{{y}} \\approx {output_val:.2f}").next_to(y_axis_point, LEFT, buff=0.2)
 
-        # --- THE ANIMATION (Single Play Call) ---
-        self.play(
-            Succession(
-                # Initial setup
-                Write(x_text),
-                AnimationGroup(FadeIn(neuron_group), Write(w_text), Create(line)),
-                Wait(0.5),
-
-                # Multiplication
-                ReplacementTransform(x_text.get_part_by_tex("0.8").copy().set_color(GREEN), prod_text.move_to(line.get_center())),
-                FadeOut(w_text),
-                Wait(0.5),
-
-                # Move values into neuron and sum them
-                AnimationGroup(
-                    prod_text.animate.move_to(sum_expression[0].get_center()),
-                    Write(bias_text),
-                    Create(line_bias)
-                ),
-                ReplacementTransform(bias_text.copy(), bias_anim_text.move_to(sum_expression[2].get_center())),
-                FadeIn(sum_expression[1]), # Fade in the '+' sign
-                
-                # Combine into the final sum z
-                Wait(1),
-                Transform(VGroup(prod_text, bias_anim_text, sum_expression[1]), z_result),
-                Wait(1.5),
-
-                # Transition to activation graph
-                AnimationGroup(
-                    FadeOut(x_text, line, bias_text, line_bias),
-                    VGroup(neuron_group, VGroup(prod_text, bias_anim_text, sum_expression[1])).animate.to_edge(LEFT)
-                ),
-                AnimationGroup(Create(axes), Create(sigmoid_graph), Write(graph_label)),
-                Wait(0.5),
-
-                # Show activation mapping
-                Create(v_line),
-                Create(h_line),
-                Write(final_output_text),
-                Wait(3)
+        # --- THE ANIMATION (Played as a single call) ---
+        return Succession(
+            # Initial setup
+            Write(x_text),
+            AnimationGroup(FadeIn(neuron_group), Write(w_text), Create(line)),
+            Wait(0.5),
+
+            # Multiplication
+            ReplacementTransform(x_text.get_part_by_tex("%.1f" % x_val).copy().set_color(GREEN), prod_text.move_to(line.get_center())),
+            FadeOut(w_text),
+            Wait(0.5),
+
+            # Move values into neuron and sum them
+            AnimationGroup(
+                prod_text.animate.move_to(sum_expression[0].get_center()),
+                Write(bias_text),
+                Create(line_bias)
+            ),
+            ReplacementTransform(bias_text.copy(), bias_anim_text.move_to(sum_expression[2].get_center())),
+            FadeIn(sum_expression[1]), # Fade in the '+' sign
+            
+            # Combine into the final sum z
+            Wait(1),
+            Transform(VGroup(prod_text, bias_anim_text, sum_expression[1]), z_result),
+            Wait(1.5),
+
+            # Transition to activation graph
+            AnimationGroup(
+                FadeOut(x_text, line, bias_text, line_bias),
+                VGroup(neuron_group, VGroup(prod_text, bias_anim_text, sum_expression[1])).animate.to_edge(LEFT)
             ),
-            run_time=20 # Total duration for the entire animation sequence
+            AnimationGroup(Create(axes), Create(sigmoid_graph), Write(graph_label)),
+            Wait(0.5),
+
+            # Show activation mapping
+            Create(v_line),
+            Create(h_line),
+            Write(final_output_text),
+            Wait(3)
         )
 
 # In the_calculator.py
 from manim import *
 
+# network_diagram.py lives at the repository root: render from there with
+# render_all.py or `python -m manim`, which put it on the import path
+from network_diagram import Segments
+
 class NeuronLayerScene(Scene):
+    # None plays the sequence at its natural duration
+    run_time = None
+
     def construct(self):
+        if self.run_time is None:
+            self.play(self.build_animation())
+        else:
+            self.play(self.build_animation(), run_time=self.run_time)
+
+    def build_animation(self):
         # --- CONFIGURATION ---
         title = Text("Part B: A Single Neuron Layer").to_edge(UP)
 
@@ -110,11 +140,12 @@ class NeuronLayerScene(Scene):
         neurons = VGroup(*[Circle(radius=0.5, color=BLUE, fill_opacity=0.2) for _ in range(3)])
         neurons.arrange(DOWN, buff=0.5)
 
-        lines = VGroup()
         input_entries = x_vec_obj.get_entries()
-        for entry in input_entries:
-            for neuron in neurons:
-                lines.add(Line(entry.get_center(), neuron.get_left(), stroke_width=2, color=GREY))
+        lines = Segments(
+            [entry.get_center() for entry in input_entries for neuron in neurons],
+            [neuron.get_left() for entry in input_entries for neuron in neurons],
+            stroke_width=2, color=GREY,
+        )
 
         diagram_top = VGroup(x_group, lines, neurons).arrange(RIGHT, buff=2)
 
@@ -143,8 +174,8 @@ class NeuronLayerScene(Scene):
         z_vec_final = Matrix([["z_1"], ["z_2"], ["z_3"]], h_buff=1.3).scale(0.9)
         y_hat_vec_final = Matrix([["\\hat{y}_1"], ["\\hat{y}_2"], ["\\hat{y}_3"]]).scale(0.8)
 
-        # --- THE ANIMATION (Single Play Call) ---
-        self.play(Succession(
+        # --- THE ANIMATION (Played as a single call) ---
+        return Succession(
             # Step 1: Show the full, clean diagram
             Write(title),
             FadeIn(full_diagram),
@@ -182,4 +213,4 @@ class NeuronLayerScene(Scene):
             FadeOut(VGroup(W_group, x_group, b_group, eq_plus)), # Fade out the now-empty z_vec_final placeholder
             ReplacementTransform(z_vec_final, y_hat_vec_final.move_to(neurons)),
             Wait(3)
-        ))
\ No newline at end of file
+        )
\ No newline at end of file
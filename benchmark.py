@@ -0,0 +1,243 @@
+# benchmark.py
+
+"""
+Renders every scene, plus scaled variants of some of them, at fixed settings
+and records how expensive each render was. Results can be stored as a JSON
+baseline and later runs compared against it, so a manim upgrade or a scene
+edit that makes rendering slower is flagged.
+
+Every benchmark runs alone in a fresh process with manim's caching off and
+its own empty media folder, so runs are cold and comparable.
+
+Usage:
+    python benchmark.py                   # run everything and print the results
+    python benchmark.py --save            # ... and store them as the baseline
+    python benchmark.py --compare         # flag regressions against the baseline
+    python benchmark.py MergeSortScene    # only benchmarks of the named scene(s)
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from render_all import QUALITIES, REPO_ROOT, apply_renderer, collect_jobs, load_module, manim_version, save_manifest
+
+BASELINE = REPO_ROOT / "benchmarks" / "baseline.json"
+
+# ``overrides`` are class attributes set on the scene before it is built
+Benchmark = namedtuple("Benchmark", ["name", "path", "scene", "overrides"], defaults=[{}])
+
+# Metrics where more is slower; a relative increase above the threshold is a regression
+TIMED = ("wall_time", "construct_time", "peak_rss_mb")
+# Metrics that should only change when a scene does; any increase is a regression
+COUNTED = ("play_calls", "frames", "rasterized_frames", "partial_movies")
+
+
+def _shuffled(n):
+    return random.Random(n).sample(range(1, n + 1), n)
+
+
+def scaled_variants():
+    """Bigger inputs for the scenes whose cost should scale gently with their size."""
+    bubble_sort = REPO_ROOT / "bubble_sort_final_layout.py"
+    merge_sort = REPO_ROOT / "merge_sort.py"
+    learning = REPO_ROOT / "ai_basics" / "manim" / "scene2_learning.py"
+    variants = []
+    for n in (8, 32, 128):
+        variants.append(Benchmark(f"BubbleSortWithCodeScene[n={n}]", bubble_sort, "BubbleSortWithCodeScene", {"numbers": _shuffled(n)}))
+        variants.append(Benchmark(f"MergeSortScene[n={n}]", merge_sort, "MergeSortScene", {"numbers": _shuffled(n)}))
+    for width in (16, 64, 256):
+        variants.append(Benchmark(f"BackpropagationScene[width={width}]", learning, "BackpropagationScene", {"layer_sizes": [width, width, 1]}))
+    for resolution in (16, 32, 64):
+        variants.append(Benchmark(f"GradientDescentScene[resolution={resolution}]", learning, "GradientDescentScene", {"surface_resolution": resolution}))
+    return variants
+
+
+def collect_benchmarks(only=()):
+    """Every discovered scene at its defaults, followed by the scaled variants."""
+    benchmarks = [Benchmark(job.scene, job.path, job.scene) for job in collect_jobs({})]
+    benchmarks += scaled_variants()
+    return [bench for bench in benchmarks if not only or bench.scene in only]
+
+
+def run_benchmark(bench, settings):
+    """
+    Worker entry point. Renders one benchmark and returns its metrics.
+    ``frames`` counts what the file writer received and ``rasterized_frames``
+    how many times the renderer actually drew the scene.
+    """
+    import resource
+
+    from manim import tempconfig
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.renderer.opengl_renderer import OpenGLRenderer
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    import frame_dedup
+    import static_layers
+    import stream_writer
+
+    counts = {"frames": 0, "rasterized_frames": 0}
+    write_frame = SceneFileWriter.write_frame
+
+    def counting_write_frame(self, frame_or_renderer, num_frames=1):
+        counts["frames"] += num_frames
+        return write_frame(self, frame_or_renderer, num_frames)
+
+    def counting_update_frame(update_frame):
+        def wrapper(self, *args, **kwargs):
+            counts["rasterized_frames"] += 1
+            return update_frame(self, *args, **kwargs)
+        return wrapper
+
+    SceneFileWriter.write_frame = counting_write_frame
+    CairoRenderer.update_frame = counting_update_frame(CairoRenderer.update_frame)
+    OpenGLRenderer.update_frame = counting_update_frame(OpenGLRenderer.update_frame)
+    # Measure what render_all.py renders, which skips unchanged frames, caches static layers
+    # and streams the whole scene into one video
+    frame_dedup.enable()
+    static_layers.enable()
+    stream_writer.enable()
+
+    start = time.perf_counter()
+    with tempconfig(dict(settings, input_file=str(bench.path))):
+        scene_class = getattr(load_module(bench.path), bench.scene)
+        for name, value in bench.overrides.items():
+            setattr(scene_class, name, value)
+        apply_renderer(scene_class, settings)
+        scene = scene_class()
+
+        construct = scene.construct
+        construct_time = []
+
+        def timed_construct():
+            began = time.perf_counter()
+            try:
+                construct()
+            finally:
+                construct_time.append(time.perf_counter() - began)
+
+        scene.construct = timed_construct
+        scene.render()
+        partial_movies = [path for path in scene.renderer.file_writer.partial_movie_files if path]
+
+    return dict(
+        counts,
+        wall_time=time.perf_counter() - start,
+        construct_time=sum(construct_time),
+        play_calls=scene.renderer.num_plays,
+        partial_movies=len(partial_movies),
+        # ru_maxrss is in kilobytes on Linux
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    )
+
+
+def run_benchmarks(benchmarks, settings, repeat=1):
+    """
+    Runs the benchmarks one at a time, each in a fresh process, and keeps
+    the fastest of ``repeat`` runs. Failed benchmarks are reported and left out.
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"), max_tasks_per_child=1) as pool:
+        for bench in benchmarks:
+            runs = []
+            for _ in range(repeat):
+                with tempfile.TemporaryDirectory(prefix="manim-bench-") as media_dir:
+                    try:
+                        runs.append(pool.submit(run_benchmark, bench, dict(settings, media_dir=media_dir)).result())
+                    except Exception as error:
+                        print(f"[fail] {bench.name}: {error!r}")
+                        break
+            if runs:
+                results[bench.name] = min(runs, key=lambda metrics: metrics["wall_time"])
+                print(format_row(bench.name, results[bench.name]))
+    return results
+
+
+def format_row(name, metrics):
+    return (
+        f"{name:<45} {metrics['wall_time']:8.2f}s {metrics['construct_time']:8.2f}s "
+        f"{metrics['play_calls']:6d} plays {metrics['frames']:7d} frames "
+        f"{metrics['partial_movies']:5d} partials {metrics['peak_rss_mb']:8.1f} MB"
+    )
+
+
+def compare(baseline, results, threshold):
+    """Returns a description of every metric that regressed against ``baseline``."""
+    regressions = []
+    for name, metrics in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for key in TIMED:
+            if old.get(key) and metrics[key] > old[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {old[key]:.2f} -> {metrics[key]:.2f} (+{metrics[key] / old[key] - 1:.0%})")
+        for key in COUNTED:
+            if key in old and metrics[key] > old[key]:
+                regressions.append(f"{name}: {key} {old[key]} -> {metrics[key]}")
+    return regressions
+
+
+def environment(settings):
+    return {
+        "manim": manim_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quality": settings["quality"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every scene and compare against a stored baseline.")
+    parser.add_argument("scenes", nargs="*", help="only benchmark these scene classes")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="runs per benchmark; the fastest is kept")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="flag regressions against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown (default: 10%%)")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    benchmarks = collect_benchmarks(set(args.scenes))
+    if args.list:
+        for bench in benchmarks:
+            print(bench.name)
+        return 0
+
+    settings = {"quality": QUALITIES[args.quality], "disable_caching": True, "progress_bar": "none"}
+    results = run_benchmarks(benchmarks, settings, args.repeat)
+
+    status = 0
+    if args.compare:
+        if not args.baseline.is_file():
+            print(f"No baseline at {args.baseline}; run with --save first.")
+            return 1
+        stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if stored.get("environment") != environment(settings):
+            print(f"Baseline was recorded with {stored.get('environment')}; numbers may not be comparable.")
+        regressions = compare(stored["results"], results, args.threshold)
+        for regression in regressions:
+            print(f"[regression] {regression}")
+        status = 1 if regressions else 0
+
+    if args.save:
+        # Re-running a subset only replaces the entries it measured
+        stored = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.is_file() else {}
+        save_manifest(args.baseline, {
+            "environment": environment(settings),
+            "results": dict(stored.get("results", {}), **results),
+        })
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,50 +2,81 @@
 
 from manim import *
 
-# Use the more stable OpenGL renderer
-config.renderer = "opengl"
+from components import sort_cell
+from sort_engine import COMPARE, LINE, SORTED, SWAP, batch_steps, bubble_sort_events, group_steps
+from text_cache import cached_text
+from trace_import import keyframes, open_trace
 
 class BubbleSortWithCodeScene(Scene):
     """
     A Manim scene to visualize Bubble Sort with a live code trace.
     This version fixes the final layout and overlap issues.
     """
+    numbers = [8, 5, 2, 6]
+
+    # A recorded trace to replay instead of sorting ``numbers``: JSONL or the
+    # log printed by test.ipynb (see trace_import.py)
+    trace = None
+
+    # Renderer used by render_all.py unless calibrate_renderers.py found a faster
+    # one on this machine; with the manim CLI pass --renderer=opengl
+    preferred_renderer = "opengl"
+
+    # Upper bound on play calls used for the sort itself. Longer traces are
+    # merged into batches, so render time stops growing with the array size.
+    max_sort_plays = 60
+
+    # Title and code block by renderer; they do not depend on the numbers, so
+    # variant_batch.py builds them once and forks every variant from there
+    _shared = {}
+
+    @classmethod
+    def shared_setup(cls):
+        """Returns copies of the title and code block, building them once per process."""
+        key = str(config.renderer)
+        if key not in cls._shared:
+            title = cached_text("Bubble Sort with Code Trace", font_size=48).to_edge(UP)
+
+            # --- Create the Code Block ---
+            code_lines = [
+                "<tt><b>def</b> bubble_sort(arr):</tt>",
+                "<tt>n = len(arr)</tt>",
+                "<tt>    <b>for</b> i <b>in</b> range(n - 1):</tt>",
+                "<tt>        <b>for</b> j <b>in</b> range(n - i - 1):</tt>",
+                "<tt>            <b>if</b> arr[j] &gt; arr[j + 1]:</tt>",
+                "<tt>                arr[j], arr[j+1] = arr[j+1], arr[j]</tt>"
+            ]
+
+            # FIX 1: Slightly reduced font size for a better fit
+            code = VGroup(*[
+                cached_text(line, markup=True, font_size=22, font="Monospace")
+                for line in code_lines
+            ]).arrange(DOWN, aligned_edge=LEFT, buff=0.3)
+
+            # Manually apply indentation
+            indent_width = 0.4
+            code[1].shift(RIGHT * indent_width)
+            code[2].shift(RIGHT * indent_width)
+            code[3].shift(RIGHT * 2 * indent_width)
+            code[4].shift(RIGHT * 3 * indent_width)
+            code[5].shift(RIGHT * 4 * indent_width)
+            cls._shared[key] = (title, code)
+        return [mobject.copy() for mobject in cls._shared[key]]
+
     def construct(self):
         # 1. --- Create Mobjects ---
-        title = Text("Bubble Sort with Code Trace", font_size=48).to_edge(UP)
-
-        # --- Create the Code Block ---
-        code_lines = [
-            "<tt><b>def</b> bubble_sort(arr):</tt>",
-            "<tt>n = len(arr)</tt>",
-            "<tt>    <b>for</b> i <b>in</b> range(n - 1):</tt>",
-            "<tt>        <b>for</b> j <b>in</b> range(n - i - 1):</tt>",
-            "<tt>            <b>if</b> arr[j] &gt; arr[j + 1]:</tt>",
-            "<tt>                arr[j], arr[j+1] = arr[j+1], arr[j]</tt>"
-        ]
-
-        # FIX 1: Slightly reduced font size for a better fit
-        code = VGroup(*[
-            MarkupText(line, font_size=22, font="Monospace")
-            for line in code_lines
-        ]).arrange(DOWN, aligned_edge=LEFT, buff=0.3)
-
-        # Manually apply indentation
-        indent_width = 0.4
-        code[1].shift(RIGHT * indent_width)
-        code[2].shift(RIGHT * indent_width)
-        code[3].shift(RIGHT * 2 * indent_width)
-        code[4].shift(RIGHT * 3 * indent_width)
-        code[5].shift(RIGHT * 4 * indent_width)
+        title, code = self.shared_setup()
 
         # --- Create the Number Mobjects ---
-        numbers = [8, 5, 2, 6]
-        mobjects = VGroup(*[
-            VGroup(
-                Square(side_length=1.0),
-                Integer(n)
-            ) for n in numbers
-        ]).arrange(RIGHT, buff=0.5)
+        numbers = self.numbers
+        if self.trace is not None:
+            numbers, events = open_trace(self.trace)
+        else:
+            events = bubble_sort_events(numbers)
+        mobjects = VGroup(*[sort_cell(n) for n in numbers]).arrange(RIGHT, buff=0.5)
+        # Long arrays are shrunk to the width the four-element layout uses
+        if mobjects.width > 5.5:
+            mobjects.scale_to_fit_width(5.5)
         
         # 2. --- Arrange the Layout ---
         
@@ -65,51 +96,84 @@ class BubbleSortWithCodeScene(Scene):
         self.wait(1)
 
         # --- Bubble Sort Logic and Animation ---
-        n = len(numbers)
-        
-        self.play(pointer.animate.next_to(code[1], LEFT))
-        self.wait(1)
-
-        for i in range(n - 1):
-            self.play(pointer.animate.next_to(code[2], LEFT))
-            self.wait(1)
-
-            for j in range(n - i - 1):
-                self.play(pointer.animate.next_to(code[3], LEFT))
-                self.wait(1)
-
-                obj1 = mobjects[j]
-                obj2 = mobjects[j+1]
-                
-                self.play(
-                    pointer.animate.next_to(code[4], LEFT),
-                    Indicate(obj1, color=YELLOW),
-                    Indicate(obj2, color=YELLOW)
-                )
-                self.wait(1)
-
-                if obj1[1].get_value() > obj2[1].get_value():
-                    self.play(pointer.animate.next_to(code[5], LEFT))
-                    self.wait(1)
-
-                    pos1 = obj1.get_center()
-                    pos2 = obj2.get_center()
-                    
-                    self.play(
-                        obj1.animate.move_to(pos2),
-                        obj2.animate.move_to(pos1),
-                        run_time=1.5
-                    )
-                    mobjects[j], mobjects[j+1] = mobjects[j+1], mobjects[j]
-                
-            sorted_element = mobjects[n - i - 1]
-            self.play(sorted_element.animate.set_color(GREEN))
-            self.wait(0.5)
+        # The sort runs once up front (or comes from the trace); the recorded events are then replayed.
+        self.replay(events, mobjects, code, pointer)
 
         # --- Final Sorted State ---
-        self.play(mobjects[0].animate.set_color(GREEN))
-        
-        sorted_text = Text("List is now sorted!", font_size=40).next_to(mobjects, DOWN, buff=1)
+        sorted_text = cached_text("List is now sorted!", font_size=40).next_to(mobjects, DOWN, buff=1)
         self.play(Write(sorted_text))
         self.play(FadeOut(pointer))
-        self.wait(3)
\ No newline at end of file
+        self.wait(3)
+
+    def replay(self, events, cells, code, pointer):
+        """Replays a recorded sort trace, merging steps into batched play calls."""
+        slots = [cell.get_center() for cell in cells]
+        order = list(range(len(cells)))  # order[slot] is the cell sitting in that slot
+
+        if self.trace is not None:
+            # Traces can be far too long to hold, so they are downsampled while streaming
+            batch_size, batches = keyframes(events, self.max_sort_plays)
+        else:
+            batch_size, batches = batch_steps(group_steps(events), self.max_sort_plays)
+        for batch in batches:
+            if batch_size == 1:
+                self.play_step(batch[0], cells, order, slots, code, pointer)
+            else:
+                self.play_batch(batch, cells, order, slots, code, pointer)
+
+    def play_step(self, step, cells, order, slots, code, pointer):
+        """Animates a single step the same way the hand-written loop used to."""
+        animations = []
+        run_time = 1
+        pause = 0
+        for event in step:
+            if event.kind == LINE:
+                animations.append(pointer.animate.next_to(code[event.i], LEFT))
+                pause = 1
+            elif event.kind == COMPARE:
+                animations.append(Indicate(cells[order[event.i]], color=YELLOW))
+                animations.append(Indicate(cells[order[event.j]], color=YELLOW))
+            elif event.kind == SWAP:
+                a, b = order[event.i], order[event.j]
+                animations.append(cells[a].animate.move_to(slots[event.j]))
+                animations.append(cells[b].animate.move_to(slots[event.i]))
+                order[event.i], order[event.j] = b, a
+                run_time = 1.5
+            elif event.kind == SORTED:
+                animations.append(cells[order[event.i]].animate.set_color(GREEN))
+                # Only the end of a pass pauses; slot 0 turns green right before the closing text
+                pause = 0.5 if event.i else 0
+
+        self.play(*animations, run_time=run_time)
+        if pause:
+            self.wait(pause)
+
+    def play_batch(self, batch, cells, order, slots, code, pointer):
+        """Collapses several steps into one play call showing their net effect."""
+        line = None
+        moved = set()
+        done = set()
+        for step in batch:
+            for event in step:
+                if event.kind == LINE:
+                    line = event.i
+                elif event.kind == SWAP:
+                    order[event.i], order[event.j] = order[event.j], order[event.i]
+                    moved.update((order[event.i], order[event.j]))
+                elif event.kind == SORTED:
+                    done.add(order[event.i])
+
+        slot_of = {cell: slot for slot, cell in enumerate(order)}
+        animations = []
+        if line is not None:
+            animations.append(pointer.animate.next_to(code[line], LEFT))
+        for index in sorted(moved | done):
+            builder = cells[index].animate
+            if index in moved:
+                builder = builder.move_to(slots[slot_of[index]])
+            if index in done:
+                builder = builder.set_color(GREEN)
+            animations.append(builder)
+
+        if animations:
+            self.play(*animations)
@@ -0,0 +1,99 @@
+# calibrate_renderers.py
+
+"""
+Finds the fastest renderer for every scene on this machine.
+
+Every scene renders a short probe, its first few play calls, once with
+each renderer that works here, every probe in a fresh process. The
+fastest renderer per scene is saved to renderer_calibration.json in the
+media folder. render_all.py reads that file and renders each scene with
+its calibrated renderer, so scenes with different choices can share one
+batch. The calibration is only used on the host and manim version it was
+made with.
+
+Usage:
+    python calibrate_renderers.py                   # calibrate every scene
+    python calibrate_renderers.py MergeSortScene    # only the named scene(s)
+    python calibrate_renderers.py --plays 20 -r 3   # longer probes, best of three
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmark import Benchmark, run_benchmarks
+from render_all import (
+    CALIBRATION,
+    QUALITIES,
+    REPO_ROOT,
+    collect_jobs,
+    host_environment,
+    job_key,
+    load_manifest,
+    save_manifest,
+)
+
+
+def available_renderers():
+    """Cairo, plus OpenGL if a headless context can be created here."""
+    renderers = ["cairo"]
+    try:
+        import moderngl
+
+        try:
+            context = moderngl.create_context(standalone=True)
+        except Exception:
+            context = moderngl.create_context(standalone=True, backend="egl")
+        context.release()
+        renderers.append("opengl")
+    except Exception as error:
+        print(f"OpenGL is not available: {error!r}")
+    return renderers
+
+
+def calibrate(jobs, renderers, settings, plays, repeat=1):
+    """
+    Probes every job with every renderer. Returns, per job key, the fastest
+    renderer and the probe time of each one. Scenes whose probe failed with
+    every renderer are left out.
+    """
+    benchmarks = [Benchmark(job_key(job), job.path, job.scene) for job in jobs]
+    times = {}
+    for renderer in renderers:
+        print(f"--- {renderer}")
+        probe = dict(settings, renderer=renderer, upto_animation_number=plays)
+        for name, metrics in run_benchmarks(benchmarks, probe, repeat).items():
+            times.setdefault(name, {})[renderer] = round(metrics["wall_time"], 3)
+    return {
+        name: {"renderer": min(seconds, key=seconds.get), "wall_time": seconds}
+        for name, seconds in times.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pick the fastest renderer for every scene on this machine.")
+    parser.add_argument("scenes", nargs="*", help="only calibrate these scene classes")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="probes per renderer; the fastest is kept")
+    parser.add_argument("--plays", type=int, default=10, help="play calls rendered per probe (default: 10)")
+    parser.add_argument("--media-dir", default=str(REPO_ROOT / "media"))
+    args = parser.parse_args(argv)
+
+    jobs = collect_jobs({}, set(args.scenes))
+    settings = {"quality": QUALITIES[args.quality], "disable_caching": True, "progress_bar": "none"}
+    scenes = calibrate(jobs, available_renderers(), settings, args.plays, args.repeat)
+    for name, entry in sorted(scenes.items()):
+        print(f"{name:<60} {entry['renderer']}")
+
+    # Re-calibrating a subset only replaces the scenes it probed
+    path = Path(args.media_dir) / CALIBRATION
+    stored = load_manifest(path)
+    if stored.get("environment") != host_environment():
+        stored = {}
+    save_manifest(path, {"environment": host_environment(), "scenes": dict(stored.get("scenes", {}), **scenes)})
+    print(f"Saved to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# components.py
+
+"""
+Building blocks shared by the scenes: the sort cell, the OSI layer box, the
+packet segment and the feed-forward network diagram.
+
+Every component is built once per set of arguments and kept as a
+prototype; each call hands out a copy. The copy still owns its point
+arrays, because manim moves and recolours mobjects in place, but it skips
+everything that makes building slow: typesetting Integers, shaping text
+and laying out networks. Prototypes are per renderer, like text_cache.py.
+"""
+
+import functools
+from collections import OrderedDict
+
+from manim import GREY, RED, WHITE, Integer, Rectangle, Square, VGroup, config
+
+from network_diagram import NetworkDiagram
+from text_cache import cached_text
+
+# Number of prototypes kept in memory
+max_cached = 256
+
+_prototypes = OrderedDict()
+
+
+def prototype(builder):
+    """Memoizes ``builder`` per argument set and returns a fresh copy of the result on every call."""
+    @functools.wraps(builder)
+    def instance(*args, **kwargs):
+        if config.dry_run:
+            # Dry runs (like the TeX recording pass) may build from placeholders; never keep those
+            return builder(*args, **kwargs)
+        key = repr((builder.__qualname__, args, sorted(kwargs.items()), str(config.renderer)))
+        mobject = _prototypes.get(key)
+        if mobject is None:
+            mobject = builder(*args, **kwargs)
+            _prototypes[key] = mobject
+            if len(_prototypes) > max_cached:
+                _prototypes.popitem(last=False)
+        else:
+            _prototypes.move_to_end(key)
+        return mobject.copy()
+
+    return instance
+
+
+@prototype
+def sort_cell(value, side_length=1.0):
+    """A square with ``value`` written in it, as used by the sorting scenes."""
+    return VGroup(Square(side_length=1.0), Integer(value)).scale(side_length)
+
+
+@prototype
+def osi_layer(name, fill_color="#333333", width=3, height=0.7):
+    """One labelled box of an OSI stack, as VGroup(label, box)."""
+    layer_box = Rectangle(width=width, height=height, fill_color=fill_color, fill_opacity=0.8, stroke_color=WHITE)
+    layer_text = cached_text(name, font_size=18).move_to(layer_box.get_center())
+    return VGroup(layer_text, layer_box)
+
+
+@prototype
+def packet_segment(text, color, width=1.5, height=0.5):
+    """A header or payload segment of a packet, as VGroup(box, label)."""
+    box = Rectangle(height=height, width=width, fill_color=color, fill_opacity=0.9, stroke_width=2)
+    label = cached_text(text, font_size=18).move_to(box.get_center())
+    return VGroup(box, label)
+
+
+@prototype
+def network(layer_sizes, node_color=RED, edge_color=GREY, edge_width=1.5, **kwargs):
+    """A NetworkDiagram, centred on the origin."""
+    return NetworkDiagram(layer_sizes, node_color=node_color, edge_color=edge_color, edge_width=edge_width, **kwargs)
@@ -0,0 +1,230 @@
+# embedding_space.py
+
+"""
+Loads large word-embedding matrices without reading them into memory,
+projects them to 2D, picks which words get a label and answers analogy
+queries. The matrix is a (vocabulary, dimensions) .npy file and is only
+ever read in chunks, so a 50k x 300 float32 file costs a few megabytes of
+RAM at most.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+
+def load_embeddings(vectors_path, words_path):
+    """
+    Memory-maps the embedding matrix at ``vectors_path`` and reads the
+    vocabulary, one word per line, from ``words_path``. Row k of the
+    matrix is the vector of word k.
+    """
+    vectors = np.load(vectors_path, mmap_mode="r")
+    words = Path(words_path).read_text(encoding="utf-8").splitlines()
+    if vectors.ndim != 2 or len(words) != len(vectors):
+        raise ValueError(f"{len(words)} words do not match an embedding matrix of shape {vectors.shape}")
+    return vectors, words
+
+
+def _chunks(n, chunk):
+    for start in range(0, n, chunk):
+        yield slice(start, min(start + chunk, n))
+
+
+def pca_2d(vectors, chunk=8192):
+    """
+    Projects every row of ``vectors`` onto its two principal components.
+    The mean and covariance are accumulated chunk by chunk, so a memory-mapped
+    matrix is streamed from disk rather than loaded. Returns an (n, 2) array.
+    """
+    n, dims = vectors.shape
+    total = np.zeros(dims)
+    scatter = np.zeros((dims, dims))
+    for rows in _chunks(n, chunk):
+        block = np.asarray(vectors[rows], dtype=np.float64)
+        total += block.sum(axis=0)
+        scatter += block.T @ block
+    mean = total / max(n, 1)
+    covariance = scatter / max(n, 1) - np.outer(mean, mean)
+    # eigh returns ascending eigenvalues, so the last two columns are the principal axes
+    components = np.linalg.eigh(covariance)[1][:, :-3:-1]
+
+    projected = np.empty((n, 2), dtype=np.float32)
+    for rows in _chunks(n, chunk):
+        projected[rows] = (np.asarray(vectors[rows], dtype=np.float64) - mean) @ components
+    return projected
+
+
+def fit_to_extent(coords, half_width, half_height, percentile=99):
+    """
+    Scales 2D ``coords`` uniformly so that ``percentile`` percent of them fall
+    inside [-half_width, half_width] x [-half_height, half_height].
+    Outliers end up off screen rather than shrinking everything else.
+    """
+    coords = coords - np.median(coords, axis=0)
+    spread = np.maximum(np.percentile(np.abs(coords), percentile, axis=0), 1e-9)
+    return coords * min(half_width / spread[0], half_height / spread[1])
+
+
+def cull_labels(points, words, bounds, max_labels=50, char_width=0.14, height=0.3, buff=0.1):
+    """
+    Picks the words whose labels can be drawn without overlapping.
+
+    ``points`` are scene positions (n, 2 or 3) and ``bounds`` is the visible
+    (x_min, y_min, x_max, y_max) at the current zoom. Labels sit up and to
+    the right of their point like ``next_to(dot, UR, buff)``, and their size
+    is estimated from the word length. Words are considered in vocabulary
+    order, which for most embedding files is frequency order. A uniform grid
+    keyed by label-sized cells means each candidate is only compared with
+    the labels already placed in its neighbouring cells. Returns the kept
+    indices.
+    """
+    x_min, y_min, x_max, y_max = bounds
+    visible = np.flatnonzero(
+        (points[:, 0] >= x_min) & (points[:, 0] <= x_max) & (points[:, 1] >= y_min) & (points[:, 1] <= y_max)
+    )
+    cell_width = max(char_width * 8, height)
+    grid = defaultdict(list)
+    kept = []
+    for index in visible:
+        if len(kept) >= max_labels:
+            break
+        left, bottom = points[index, 0] + buff, points[index, 1] + buff
+        box = (left, bottom, left + char_width * len(words[index]), bottom + height)
+        if box[2] > x_max or box[3] > y_max:
+            continue
+
+        cells = [
+            (cx, cy)
+            for cx in range(int(np.floor(box[0] / cell_width)), int(np.floor(box[2] / cell_width)) + 1)
+            for cy in range(int(np.floor(box[1] / height)), int(np.floor(box[3] / height)) + 1)
+        ]
+        overlaps = any(
+            box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]
+            for cell in cells
+            for other in grid[cell]
+        )
+        if overlaps:
+            continue
+        for cell in cells:
+            grid[cell].append(box)
+        kept.append(index)
+    return np.array(kept, dtype=int)
+
+
+def _unit_rows(vectors, path, chunk=8192):
+    """
+    Returns the row norms of ``vectors``. The rows scaled to unit length are
+    written chunk by chunk into a float32 .npy file at ``path``, so the
+    normalized matrix never has to fit into memory.
+    """
+    norms = np.empty(len(vectors), dtype=np.float32)
+    unit = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=vectors.shape)
+    for rows in _chunks(len(vectors), chunk):
+        block = np.asarray(vectors[rows], dtype=np.float32)
+        norms[rows] = np.linalg.norm(block, axis=1)
+        unit[rows] = block / np.maximum(norms[rows], 1e-12)[:, None]
+    unit.flush()
+    del unit
+    return norms
+
+
+class AnalogyIndex:
+    """
+    Cosine-similarity queries over an embedding matrix.
+
+    The rows are normalized once up front into a memory-mapped file, so
+    every query is a single matrix-vector product followed by an
+    argpartition for the top k. With ``cache_dir`` the normalized matrix and
+    norms are kept next to each other and memory-mapped by later processes,
+    so a batch of renders pays for the setup once; otherwise the matrix
+    goes to a temporary file.
+    """
+
+    def __init__(self, vectors, words, cache_dir=None, chunk=8192):
+        self.words = list(words)
+        self.index = {word: k for k, word in enumerate(self.words)}
+
+        cache = None
+        if cache_dir is not None:
+            key = getattr(vectors, "filename", None)
+            if key is not None:
+                stat = Path(key).stat()
+                digest = hashlib.sha256(repr((str(Path(key).resolve()), stat.st_size, stat.st_mtime_ns)).encode())
+                cache = Path(cache_dir) / digest.hexdigest()
+
+        if cache is not None and (cache / "unit.npy").is_file():
+            self.norms = np.load(cache / "norms.npy")
+            self.unit = np.load(cache / "unit.npy", mmap_mode="r")
+            return
+
+        directory = cache if cache is not None else Path(tempfile.mkdtemp(prefix="analogy_index_"))
+        directory.mkdir(parents=True, exist_ok=True)
+        unit = directory / f"unit.{os.getpid()}.tmp.npy"
+        self.norms = _unit_rows(vectors, unit, chunk)
+        if cache is None:
+            self.unit = np.load(unit, mmap_mode="r")
+            # The mapping stays valid after the file is unlinked, and the disk space is freed with it
+            unit.unlink()
+            directory.rmdir()
+            return
+
+        # unit.npy marks a complete cache entry, so it is moved into place last
+        tmp = cache / f"norms.{os.getpid()}.tmp.npy"
+        np.save(tmp, self.norms)
+        tmp.replace(cache / "norms.npy")
+        unit.replace(cache / "unit.npy")
+        self.unit = np.load(cache / "unit.npy", mmap_mode="r")
+
+    def lookup(self, word):
+        """Row of ``word``, falling back to its lower-case form."""
+        if word in self.index:
+            return self.index[word]
+        if word.lower() in self.index:
+            return self.index[word.lower()]
+        raise KeyError(f"{word!r} is not in the vocabulary")
+
+    def nearest(self, target, k=5, exclude=()):
+        """The ``k`` (word, cosine similarity) pairs closest to vector ``target``, best first."""
+        target = np.asarray(target, dtype=np.float32)
+        similarity = self.unit @ (target / max(np.linalg.norm(target), 1e-12))
+        similarity[list(exclude)] = -np.inf
+        k = min(k, len(similarity) - len(exclude))
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarity, k - 1)[:k]
+        top = top[np.argsort(-similarity[top])]
+        return [(self.words[i], float(similarity[i])) for i in top]
+
+    def neighbours(self, word, k=5):
+        row = self.lookup(word)
+        return self.nearest(self.unit[row], k, exclude=(row,))
+
+    def analogy(self, a, b, c, k=5):
+        """
+        Answers "a - b + c ≈ ?" (e.g. King - Man + Woman) by the usual 3CosAdd
+        rule on unit vectors. The three query words are never returned.
+        """
+        rows = [self.lookup(word) for word in (a, b, c)]
+        target = self.unit[rows[0]] - self.unit[rows[1]] + self.unit[rows[2]]
+        return self.nearest(target, k, exclude=rows)
+
+    def analogies(self, queries, k=5):
+        """analogy() for many (a, b, c) queries at once, with one matrix-matrix product."""
+        rows = np.array([[self.lookup(word) for word in query] for query in queries], dtype=int).reshape(-1, 3)
+        targets = self.unit[rows[:, 0]] - self.unit[rows[:, 1]] + self.unit[rows[:, 2]]
+        targets /= np.maximum(np.linalg.norm(targets, axis=1, keepdims=True), 1e-12)
+        similarity = self.unit @ targets.T
+        k = min(k, len(self.words) - 3)
+        results = []
+        for q, exclude in enumerate(rows):
+            column = similarity[:, q]
+            column[exclude] = -np.inf
+            top = np.argpartition(-column, k - 1)[:k]
+            top = top[np.argsort(-column[top])]
+            results.append([(self.words[i], float(column[i])) for i in top])
+        return results
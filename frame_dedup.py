@@ -0,0 +1,138 @@
+# frame_dedup.py
+
+"""
+Skips rasterizing frames that would look exactly like the previous one.
+
+Manim already writes a pure ``self.wait()`` as one frozen frame, but it
+rasterizes every frame again as soon as anything has an updater, and in
+intervals of a play where nothing moves, such as the Wait() steps of a
+Succession or the tail of a finished animation. With dedup enabled, the
+renderer fingerprints the state of whatever it is about to draw before
+each frame. When the fingerprint matches the previous frame of the same
+play, the last frame is handed to the file writer again instead of being
+drawn.
+
+The fingerprint covers the points, colours and scalar style of every
+mobject in the drawn families, their draw order and the camera. It is
+reset at the start of every play call, because the static background the
+Cairo renderer draws over can change between plays.
+
+Usage:
+    import frame_dedup
+    frame_dedup.enable()   # before the scene renders; render_all.py does this
+"""
+
+import functools
+import hashlib
+
+import numpy as np
+
+_originals = []
+
+
+def _hash_value(digest, name, value, max_size):
+    if isinstance(value, np.ndarray):
+        if value.dtype != object and (max_size is None or value.size <= max_size):
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(value))
+        return True
+    if isinstance(value, (bool, int, float, str, np.generic)):
+        digest.update(f"{name}={value!r}".encode())
+        return True
+    return False
+
+
+def _hash_state(digest, obj, max_size=None):
+    """
+    Hashes the array and scalar attributes of ``obj``, including those kept
+    in dict attributes like OpenGL's ``data`` and ``uniforms``. Arrays larger
+    than ``max_size`` are left out.
+    """
+    for name, value in vars(obj).items():
+        if _hash_value(digest, name, value, max_size):
+            continue
+        if isinstance(value, dict):
+            for key, item in value.items():
+                _hash_value(digest, f"{name}.{key}", item, max_size)
+
+
+def frame_fingerprint(mobjects, camera):
+    """A digest of everything that decides how ``mobjects`` look through ``camera``."""
+    digest = hashlib.blake2b(digest_size=16)
+    for mobject in mobjects:
+        for member in mobject.get_family():
+            digest.update(id(member).to_bytes(8, "little"))
+            _hash_state(digest, member)
+
+    # Only small camera attributes matter (frame centre, angles); the pixel buffers do not
+    _hash_state(digest, camera, max_size=16)
+    for value in vars(camera).values():
+        if hasattr(value, "get_family"):
+            # ThreeDCamera keeps its angles in ValueTrackers
+            _hash_state(digest, value)
+    return digest.digest()
+
+
+def _reset_each_play(play):
+    def wrapper(self, *args, **kwargs):
+        self._held_frame = None
+        return play(self, *args, **kwargs)
+    return wrapper
+
+
+def _cairo_render(render):
+    # Same steps as CairoRenderer.render, keeping the frame for reuse
+    def wrapper(self, scene, time, moving_mobjects):
+        if self.skip_animations:
+            return render(self, scene, time, moving_mobjects)
+        fingerprint = frame_fingerprint(moving_mobjects, self.camera)
+        held = getattr(self, "_held_frame", None)
+        if held is not None and held[0] == fingerprint:
+            self.add_frame(held[1])
+            return
+        self.update_frame(scene, moving_mobjects)
+        frame = self.get_frame()
+        self.add_frame(frame)
+        self._held_frame = (fingerprint, frame)
+    return wrapper
+
+
+def _opengl_render(render):
+    def wrapper(self, scene, frame_offset, moving_mobjects):
+        if self.skip_animations or self.window is not None:
+            return render(self, scene, frame_offset, moving_mobjects)
+        # OpenGL redraws every mobject each frame, so all of them go into the fingerprint
+        fingerprint = frame_fingerprint(scene.mobjects, scene.camera)
+        held = getattr(self, "_held_frame", None)
+        if held is not None and held == fingerprint:
+            # The framebuffer still holds the previous frame; only the readback is repeated
+            self.file_writer.write_frame(self)
+            return
+        render(self, scene, frame_offset, moving_mobjects)
+        self._held_frame = fingerprint
+    return wrapper
+
+
+def _patch(owner, name, make_wrapper):
+    original = getattr(owner, name)
+    _originals.append((owner, name, original))
+    setattr(owner, name, functools.wraps(original)(make_wrapper(original)))
+
+
+def enable():
+    """Turns deduplication on for both renderers."""
+    if _originals:
+        return
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.renderer.opengl_renderer import OpenGLRenderer
+
+    _patch(CairoRenderer, "play", _reset_each_play)
+    _patch(CairoRenderer, "render", _cairo_render)
+    _patch(OpenGLRenderer, "play", _reset_each_play)
+    _patch(OpenGLRenderer, "render", _opengl_render)
+
+
+def disable():
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
@@ -2,7 +2,43 @@
 
 from manim import *
 
+from embedding_space import AnalogyIndex, cull_labels, fit_to_extent, load_embeddings, pca_2d
+
+# Characters that LaTeX treats specially; the replacements work in text and math mode alike
+TEX_SPECIAL = {
+    "\\": r"\text{\textbackslash}",
+    "{": r"\{",
+    "}": r"\}",
+    "_": r"\_",
+    "&": r"\&",
+    "#": r"\#",
+    "%": r"\%",
+    "$": r"\$",
+    "^": r"\text{\textasciicircum}",
+    "~": r"\text{\textasciitilde}",
+}
+
+
+def tex_escape(word):
+    """``word`` with every LaTeX special character escaped, for vocabularies of arbitrary tokens."""
+    return "".join(TEX_SPECIAL.get(char, char) for char in word)
+
 class WordEmbedding(Scene):
+    # A (vocabulary, dimensions) .npy matrix and its vocabulary, one word per
+    # line. When set, every word is drawn from a memory-mapped PCA projection;
+    # otherwise the scene uses four hand-placed words.
+    embedding_file = None
+    vocabulary_file = None
+    max_labels = 60
+
+    # "analogy[0] - analogy[1] + analogy[2]". With an embedding the answer and
+    # its top_k neighbours are computed; the hand-placed words only cover the
+    # default analogy and assume its answer.
+    analogy = ("King", "Man", "Woman")
+    answer = "Queen"
+    top_k = 5
+    relationship_names = ("Gender", "Royalty")
+
     def construct(self):
         """
         Main method to construct the word embedding visualization.
@@ -57,35 +93,68 @@ class WordEmbedding(Scene):
             "Queen": np.array([2, 2, 0]),
         }
 
-        # Create dots and labels for each word
-        self.dots = VGroup(*[Dot(self.coords[word], radius=0.1) for word in self.coords])
-        self.labels = VGroup(*[Text(word, font_size=24).next_to(self.dots[i], UR, buff=0.1) for i, word in enumerate(self.coords)])
+        self.neighbours = None
+        if self.embedding_file is not None:
+            self.load_word_cloud()
+        else:
+            # Create dots and labels for each word
+            self.dots = VGroup(*[Dot(self.coords[word], radius=0.1) for word in self.coords])
+            self.labels = VGroup(*[Text(word, font_size=24).next_to(self.dots[i], UR, buff=0.1) for i, word in enumerate(self.coords)])
         
         self.play(FadeIn(self.dots), FadeIn(self.labels), FadeOut(intro_text))
         self.wait(1)
 
+    def load_word_cloud(self):
+        """Draws the whole vocabulary as one point cloud and labels the words that have room."""
+        vectors, words = load_embeddings(self.embedding_file, self.vocabulary_file)
+        coords = fit_to_extent(pca_2d(vectors), 7, 4.5)
+        points = self.plane.c2p(coords)
+        self.dots = PMobject(stroke_width=2).add_points(points, color=WHITE)
+
+        # Only the part of the frame below the title is free for labels
+        half_width = config.frame_width / 2
+        visible = (-half_width, -config.frame_height / 2, half_width, self.title.get_bottom()[1])
+        kept = cull_labels(points, words, visible, self.max_labels)
+        self.labels = VGroup(*[Text(words[k], font_size=24).next_to(points[k], UR, buff=0.1) for k in kept])
+
+        # Vocabularies that lack an analogy word keep the hand-placed positions
+        known = set(words)
+        if not all(word in known or word.lower() in known for word in self.analogy):
+            logger.warning(f"{self.embedding_file} lacks some of {self.analogy}; using the hand-placed words")
+            return
+
+        # Normalizing the vocabulary is the expensive part; the index caches it
+        # under the media folder so a batch of analogy renders does it once
+        index = AnalogyIndex(vectors, words, cache_dir=config.get_dir("media_dir") / "embedding_cache")
+        self.neighbours = index.analogy(*self.analogy, k=self.top_k)
+        self.answer = self.neighbours[0][0]
+        self.coords = {word: points[index.lookup(word)] for word in (*self.analogy, self.answer)}
+
     def animate_vector_arithmetic(self):
-        """Animates the equation: King - Man + Woman = Queen."""
-        equation = MathTex(r"\text{King} - \text{Man} + \text{Woman} \approx \text{Queen}", font_size=48).next_to(self.title, DOWN)
+        """Animates the equation, by default King - Man + Woman = Queen."""
+        king, man, woman = self.analogy
+        queen = self.answer
+        tex = {word: tex_escape(word) for word in (king, man, woman, queen)}
+        equation = MathTex(rf"\text{{{tex[king]}}} - \text{{{tex[man]}}} + \text{{{tex[woman]}}} \approx \text{{{tex[queen]}}}", font_size=48).next_to(self.title, DOWN)
         self.play(Write(equation))
 
         # 1. Start with the "King" vector
-        king_vec = Arrow(ORIGIN, self.coords["King"], buff=0, color=YELLOW)
-        king_label = MathTex(r"\vec{King}", color=YELLOW).next_to(king_vec.get_center(), LEFT)
+        king_vec = Arrow(ORIGIN, self.coords[king], buff=0, color=YELLOW)
+        king_label = MathTex(rf"\vec{{{tex[king]}}}", color=YELLOW).next_to(king_vec.get_center(), LEFT)
         self.play(GrowArrow(king_vec), Write(king_label))
         self.wait(1)
 
         # 2. Subtract the "Man" vector
-        man_vec = Arrow(ORIGIN, self.coords["Man"], buff=0, color=BLUE)
-        man_label = MathTex(r"\vec{Man}", color=BLUE).next_to(man_vec.get_center(), LEFT)
+        man_vec = Arrow(ORIGIN, self.coords[man], buff=0, color=BLUE)
+        man_label = MathTex(rf"\vec{{{tex[man]}}}", color=BLUE).next_to(man_vec.get_center(), LEFT)
         self.play(GrowArrow(man_vec), Write(man_label))
         self.wait(1)
         
         # Animate subtracting it (i.e., adding the negative)
-        neg_man_vec = Arrow(self.coords["King"], self.coords["King"] - self.coords["Man"], buff=0, color=BLUE)
+        neg_man_vec = Arrow(self.coords[king], self.coords[king] - self.coords[man], buff=0, color=BLUE)
         self.play(
             FadeOut(man_vec, man_label),
-            Transform(king_vec, Arrow(ORIGIN, self.coords["King"] - self.coords["Man"], buff=0, color=YELLOW)),
+            Transform(king_vec, Arrow(ORIGIN, self.coords[king] - self.coords[man], buff=0, color=YELLOW)),
             GrowArrow(neg_man_vec)
         )
         self.wait(1)
@@ -93,47 +162,59 @@ class WordEmbedding(Scene):
 
 
         # 3. Add the "Woman" vector
-        woman_vec = Arrow(ORIGIN, self.coords["Woman"], buff=0, color=RED)
-        woman_label = MathTex(r"\vec{Woman}", color=RED).next_to(woman_vec.get_center(), RIGHT)
+        woman_vec = Arrow(ORIGIN, self.coords[woman], buff=0, color=RED)
+        woman_label = MathTex(rf"\vec{{{tex[woman]}}}", color=RED).next_to(woman_vec.get_center(), RIGHT)
         self.play(GrowArrow(woman_vec), Write(woman_label))
         self.wait(1)
 
         # Animate adding it to the result
-        add_woman_vec = Arrow(king_vec.get_end(), king_vec.get_end() + self.coords["Woman"], buff=0, color=RED)
+        add_woman_vec = Arrow(king_vec.get_end(), king_vec.get_end() + self.coords[woman], buff=0, color=RED)
         self.play(
             FadeOut(woman_vec, woman_label),
-            Transform(king_vec, Arrow(ORIGIN, king_vec.get_end() + self.coords["Woman"], buff=0, color=YELLOW)),
+            Transform(king_vec, Arrow(ORIGIN, king_vec.get_end() + self.coords[woman], buff=0, color=YELLOW)),
             GrowArrow(add_woman_vec)
         )
         self.wait(1)
 
         # 4. Show the result is the "Queen" vector
-        queen_vec = Arrow(ORIGIN, self.coords["Queen"], buff=0, color=GREEN, stroke_width=8)
+        queen_vec = Arrow(ORIGIN, self.coords[queen], buff=0, color=GREEN, stroke_width=8)
         self.play(FadeOut(add_woman_vec, king_label), ReplacementTransform(king_vec, queen_vec))
         
-        result_text = Text("Result", font_size=24, color=GREEN).next_to(self.coords["Queen"], DR)
+        result_text = Text("Result", font_size=24, color=GREEN).next_to(self.coords[queen], DR)
         self.play(Write(result_text))
         self.wait(2)
+
+        if self.neighbours:
+            # The words actually closest to the result, with their cosine similarity
+            ranking = VGroup(*[
+                Text(f"{word}  {similarity:.2f}", font_size=24) for word, similarity in self.neighbours
+            ]).arrange(DOWN, aligned_edge=LEFT).to_corner(DR)
+            self.play(FadeIn(ranking))
+            self.wait(2)
+            self.play(FadeOut(ranking))
+
         self.play(FadeOut(queen_vec, result_text, equation))
 
     def show_relationships(self):
         """Draws vectors between words to show learned relationships."""
+        king, man, woman = self.analogy
+        queen = self.answer
         rel_text = Text("The distances and directions represent relationships.", font_size=28).next_to(self.title, DOWN)
         self.play(Write(rel_text))
 
         # Gender relationship
-        gender_vec1 = Arrow(self.coords["Man"], self.coords["Woman"], buff=0.1, color=PINK, max_tip_length_to_length_ratio=0.1)
-        gender_vec2 = Arrow(self.coords["King"], self.coords["Queen"], buff=0.1, color=PINK, max_tip_length_to_length_ratio=0.1)
-        gender_label = Text("Gender", font_size=24, color=PINK).next_to(gender_vec1, DOWN)
+        gender_vec1 = Arrow(self.coords[man], self.coords[woman], buff=0.1, color=PINK, max_tip_length_to_length_ratio=0.1)
+        gender_vec2 = Arrow(self.coords[king], self.coords[queen], buff=0.1, color=PINK, max_tip_length_to_length_ratio=0.1)
+        gender_label = Text(self.relationship_names[0], font_size=24, color=PINK).next_to(gender_vec1, DOWN)
         
         self.play(GrowArrow(gender_vec1), GrowArrow(gender_vec2))
         self.play(Write(gender_label))
         self.wait(2)
 
         # Royalty relationship
-        royalty_vec1 = Arrow(self.coords["Man"], self.coords["King"], buff=0.1, color=GOLD, max_tip_length_to_length_ratio=0.1)
-        royalty_vec2 = Arrow(self.coords["Woman"], self.coords["Queen"], buff=0.1, color=GOLD, max_tip_length_to_length_ratio=0.1)
-        royalty_label = Text("Royalty", font_size=24, color=GOLD).next_to(royalty_vec1, LEFT)
+        royalty_vec1 = Arrow(self.coords[man], self.coords[king], buff=0.1, color=GOLD, max_tip_length_to_length_ratio=0.1)
+        royalty_vec2 = Arrow(self.coords[woman], self.coords[queen], buff=0.1, color=GOLD, max_tip_length_to_length_ratio=0.1)
+        royalty_label = Text(self.relationship_names[1], font_size=24, color=GOLD).next_to(royalty_vec1, LEFT)
 
         self.play(GrowArrow(royalty_vec1), GrowArrow(royalty_vec2))
         self.play(Write(royalty_label))
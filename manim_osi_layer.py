@@ -2,6 +2,11 @@
 
 from manim import *
 
+from components import osi_layer, packet_segment
+from packet_schedule import max_in_flight, pipeline_schedule
+from scene_sections import run_sections
+from text_cache import cached_text
+
 # Define custom colors for clarity
 COLORS = {
     "data": PURE_BLUE,
@@ -16,25 +21,27 @@ COLORS = {
 }
 
 class OSITraversal(Scene):
-    def construct(self):
-        """
-        Main method to construct the OSI model traversal animation.
-        """
+    # Phases of the animation, in order. Each one is its own section, so
+    # render_sections.py can render them in parallel.
+    sections = [
         # --- 1. SETUP THE SCENE ---
-        self.setup_layout()
-        self.introduce_scene()
-
+        "setup_layout",
+        "introduce_scene",
         # --- 2. ENCAPSULATION AT CLIENT ---
-        self.show_encapsulation()
-
+        "show_encapsulation",
         # --- 3. TRANSMISSION ---
-        self.show_transmission()
-
+        "show_transmission",
         # --- 4. DECAPSULATION AT SERVER ---
-        self.show_decapsulation()
-
+        "show_decapsulation",
         # --- 5. CONCLUSION ---
-        self.show_conclusion()
+        "show_conclusion",
+    ]
+
+    def construct(self):
+        """
+        Main method to construct the OSI model traversal animation.
+        """
+        run_sections(self, self.sections)
 
     def setup_layout(self):
         """Creates the visual layout of the OSI stacks and labels."""
@@ -61,14 +68,14 @@ class OSITraversal(Scene):
 
     def introduce_scene(self):
         """Displays the title and introduction text."""
-        title = Text("HTTP Packet Traversal (OSI Model)").to_edge(UP)
+        title = cached_text("HTTP Packet Traversal (OSI Model)").to_edge(UP)
         self.play(Write(title))
         self.wait(1)
         self.title = title
 
     def show_encapsulation(self):
         """Animates the data encapsulation process down the client's OSI stack."""
-        encapsulation_title = Text("1. Encapsulation (Client Side)").scale(0.7).next_to(self.title, DOWN)
+        encapsulation_title = cached_text("1. Encapsulation (Client Side)").scale(0.7).next_to(self.title, DOWN)
         self.play(Write(encapsulation_title))
 
         # Start with the initial data packet at the Application Layer
@@ -85,7 +92,7 @@ class OSITraversal(Scene):
             
             # Correctly get layer name from the layers VGroup
             layer_name = self.client_stack[1][source_layer_index].submobjects[0].text
-            step_text = Text(f"Adding {layer_name} Header", font_size=24).next_to(encapsulation_title, DOWN)
+            step_text = cached_text(f"Adding {layer_name} Header", font_size=24).next_to(encapsulation_title, DOWN)
             self.play(Write(step_text))
 
             new_header = self.create_packet_segment(f"H{source_layer_number}", COLORS[f"l{source_layer_number}"])
@@ -103,11 +110,11 @@ class OSITraversal(Scene):
 
     def show_transmission(self):
         """Animates the packet turning into bits and traversing the physical medium."""
-        transmission_title = Text("2. Transmission (Physical Layer)").scale(0.7).next_to(self.title, DOWN)
+        transmission_title = cached_text("2. Transmission (Physical Layer)").scale(0.7).next_to(self.title, DOWN)
         self.play(Write(transmission_title))
 
         # Transform the packet into a representation of bits
-        bits = Text("01101000011101000111010001110000...", font_size=18, color=COLORS["bits"])
+        bits = cached_text("01101000011101000111010001110000...", font_size=18, color=COLORS["bits"])
         # Correctly position bits in the Physical layer (index 6)
         bits.move_to(self.client_stack[1][6].get_center())
         self.play(ReplacementTransform(self.final_packet, bits))
@@ -124,7 +131,7 @@ class OSITraversal(Scene):
 
     def show_decapsulation(self):
         """Animates the data decapsulation process up the server's OSI stack."""
-        decapsulation_title = Text("3. Decapsulation (Server Side)").scale(0.7).next_to(self.title, DOWN)
+        decapsulation_title = cached_text("3. Decapsulation (Server Side)").scale(0.7).next_to(self.title, DOWN)
         self.play(Write(decapsulation_title))
 
         packet = self.final_packet.copy() # Use a copy to avoid modifying the original
@@ -136,7 +143,7 @@ class OSITraversal(Scene):
             
             # Correctly get layer name from the layers VGroup
             layer_name = self.server_stack[1][source_layer_index].submobjects[0].text
-            step_text = Text(f"Processing & Removing {layer_name} Header", font_size=24).next_to(decapsulation_title, DOWN)
+            step_text = cached_text(f"Processing & Removing {layer_name} Header", font_size=24).next_to(decapsulation_title, DOWN)
             self.play(Write(step_text))
 
             # The packet to be left after removing the header
@@ -155,7 +162,7 @@ class OSITraversal(Scene):
 
     def show_conclusion(self):
         """Shows the final state and conclusion text."""
-        conclusion_text = Text("Data successfully received by the Server's Application Layer!").scale(0.7)
+        conclusion_text = cached_text("Data successfully received by the Server's Application Layer!").scale(0.7)
         conclusion_text.next_to(self.title, DOWN)
         self.play(Write(conclusion_text))
         self.wait(3)
@@ -171,20 +178,104 @@ class OSITraversal(Scene):
         ]
         
         for name in layer_names:
-            layer_box = Rectangle(width=3, height=0.7, fill_color=COLORS["layer_bg"], fill_opacity=0.8, stroke_color=WHITE)
-            layer_text = Text(name, font_size=18).move_to(layer_box.get_center())
-            layer = VGroup(layer_text, layer_box)
-            layers.add(layer)
+            layers.add(osi_layer(name, COLORS["layer_bg"]))
             
         layers.arrange(DOWN, buff=0)
         
-        title = Text(title_text, font_size=32).next_to(layers, UP)
+        title = cached_text(title_text, font_size=32).next_to(layers, UP)
         # The final stack is a VGroup containing the title and the layers VGroup
         stack = VGroup(title, layers).move_to(position)
         return stack
 
     def create_packet_segment(self, text, color):
         """Helper function to create a segment of a packet (header or data)."""
-        box = Rectangle(height=0.5, width=1.5, fill_color=color, fill_opacity=0.9, stroke_width=2)
-        label = Text(text, font_size=18).move_to(box.get_center())
-        return VGroup(box, label)
+        return packet_segment(text, color)
+
+
+class OSIPipeline(OSITraversal):
+    """
+    Many packets in flight at once, like a pipelined TCP stream. Packet
+    positions come from a precomputed schedule, every packet that moves in a
+    tick is animated in the same play, and the packets are drawn from a pool
+    built once instead of creating new segments for every header.
+    """
+    sections = [
+        # --- 1. SETUP THE SCENE ---
+        "setup_layout",
+        "introduce_scene",
+        # --- 2. PIPELINED STREAM ---
+        "show_pipeline",
+        # --- 3. CONCLUSION ---
+        "show_conclusion",
+    ]
+
+    num_packets = 24
+    window = 8
+    tick_time = 0.6
+
+    def show_pipeline(self):
+        """Streams the packets down the client stack, across the medium and up the server stack."""
+        pipeline_title = cached_text(
+            f"Pipelining: {self.num_packets} packets, window of {self.window}"
+        ).scale(0.7).next_to(self.title, DOWN)
+        self.play(Write(pipeline_title))
+
+        # Stage k is a layer: down the client stack, then up the server stack
+        layers = [*self.client_stack[1], *reversed(self.server_stack[1])]
+        delivered_stage = len(layers)
+        schedule = pipeline_schedule(self.num_packets, len(layers), self.window)
+
+        free = [self.create_pooled_packet() for _ in range(max_in_flight(schedule, len(layers)))]
+        slots = {}
+
+        delivered = Integer(0)
+        counter = VGroup(cached_text("Delivered:", font_size=24), delivered).arrange(RIGHT).to_edge(DOWN)
+        self.play(FadeIn(counter))
+
+        for tick, stages in enumerate(schedule):
+            previous = schedule[tick - 1] if tick else np.full_like(stages, -1)
+            moving = np.flatnonzero(stages != previous)
+            animations = []
+            for p in moving:
+                stage = stages[p]
+                if stage == 0:
+                    slots[p] = free.pop()
+                    self.add(self.set_packet_state(slots[p], layers[0], 0, shown=False))
+                packet = slots[p]
+                packet.generate_target()
+                if stage == delivered_stage:
+                    self.set_packet_state(packet.target, layers[-1], 0, shown=False)
+                else:
+                    # Headers are added on the way down and removed on the way up
+                    self.set_packet_state(packet.target, layers[stage], min(stage, len(layers) - 1 - stage))
+                animations.append(MoveToTarget(packet))
+
+            done = int((stages == delivered_stage).sum())
+            if done != delivered.get_value():
+                animations.append(ChangeDecimalToValue(delivered, done))
+            if animations:
+                self.play(*animations, run_time=self.tick_time)
+
+            # Delivered packets go back to the pool
+            for p in moving:
+                if stages[p] == delivered_stage:
+                    self.remove(slots[p])
+                    free.append(slots.pop(p))
+
+        self.wait(1)
+        self.play(FadeOut(pipeline_title, counter))
+
+    def create_pooled_packet(self):
+        """A packet holding every header, [H2 .. H7, Data], small enough to fit inside a layer box."""
+        segments = [self.create_packet_segment(f"H{n}", COLORS[f"l{n}"]) for n in range(2, 8)]
+        segments.append(self.create_packet_segment("Data", COLORS["data"]))
+        return VGroup(*segments).arrange(RIGHT, buff=0).scale_to_fit_width(2.6)
+
+    def set_packet_state(self, packet, layer, headers, shown=True):
+        """Moves a pooled packet onto ``layer`` and shows its ``headers`` outermost headers."""
+        packet.move_to(layer.get_center())
+        for index, (box, label) in enumerate(packet):
+            opacity = 1.0 if shown and index >= len(packet) - 1 - headers else 0.0
+            box.set_fill(opacity=0.9 * opacity).set_stroke(opacity=opacity)
+            label.set_opacity(opacity)
+        return packet
@@ -2,131 +2,92 @@
 
 from manim import *
 
-# Use the more stable OpenGL renderer
-config.renderer = "opengl"
+from components import sort_cell
+from sort_engine import merge_sort_layout, merge_sort_trace
+from text_cache import cached_text
 
 class MergeSortScene(Scene):
     """
-    A Manim scene to visualize the Merge Sort algorithm with 4 numbers.
-    This version fixes the premature ending bug.
+    A Manim scene to visualize the Merge Sort algorithm on any list of numbers.
+    Each recursion level is laid out up front and animated as a single move.
     """
+    numbers = [8, 5, 2, 6]
+
+    # Renderer used by render_all.py unless calibrate_renderers.py found a faster
+    # one on this machine; with the manim CLI pass --renderer=opengl
+    preferred_renderer = "opengl"
+
+    # Above this many elements the cells are coloured by value instead of labelled
+    max_labelled_cells = 16
+
     def construct(self):
         # 1. --- Initial Setup ---
-        title = Text("Merge Sort Algorithm", font_size=48).to_edge(UP)
+        title = cached_text("Merge Sort Algorithm", font_size=48).to_edge(UP)
         self.play(Write(title))
 
-        numbers = [8, 5, 2, 6]
-        
-        mobjects = VGroup(*[
-            VGroup(
-                Square(side_length=1.0),
-                Integer(n)
-            ) for n in numbers
-        ]).arrange(RIGHT, buff=0.5)
+        numbers = self.numbers
+        trace = merge_sort_trace(numbers)
+        positions, side_length = merge_sort_layout(trace.levels)
+        depth = len(trace.levels) - 1
+
+        mobjects = self.create_cells(numbers, side_length)
+        for cell, point in zip(mobjects, positions[0]):
+            cell.move_to(point)
 
-        status_text = Text("Start with an unsorted list.", font_size=36).next_to(mobjects, DOWN, buff=1.5)
+        self.status_text = cached_text("Start with an unsorted list.", font_size=36).to_edge(DOWN)
 
         self.play(FadeIn(mobjects, shift=UP))
-        self.play(Write(status_text))
+        self.play(Write(self.status_text))
         self.wait(2)
 
         # 2. --- Divide Phase ---
-        new_text = Text("1. Divide: Split the list until each element is in its own list.", font_size=36).next_to(mobjects, DOWN, buff=1.5)
-        left_half = VGroup(mobjects[0], mobjects[1])
-        right_half = VGroup(mobjects[2], mobjects[3])
-        
-        self.play(
-            FadeOut(status_text), FadeIn(new_text),
-            left_half.animate.shift(LEFT * 2 + DOWN * 1.5),
-            right_half.animate.shift(RIGHT * 2 + DOWN * 1.5)
-        )
-        status_text = new_text
-        self.wait(2)
-        
-        elem_8, elem_5 = left_half[0], left_half[1]
-        elem_2, elem_6 = right_half[0], right_half[1]
-        
-        self.play(
-            elem_8.animate.shift(LEFT * 1 + DOWN * 1.5),
-            elem_5.animate.shift(RIGHT * 1 + DOWN * 1.5),
-            elem_2.animate.shift(LEFT * 1 + DOWN * 1.5),
-            elem_6.animate.shift(RIGHT * 1 + DOWN * 1.5),
-        )
-        self.wait(2)
+        # Nothing moves between slots while dividing, so every level keeps the input order
+        unsorted = np.arange(len(numbers))
+        for d in range(1, depth + 1):
+            animations = [self.move_cells(mobjects, unsorted, positions[d])]
+            if d == 1:
+                animations += self.update_status("1. Divide: Split the list until each element is in its own list.")
+            self.play(*animations)
+            self.wait(2)
 
         # 3. --- Conquer & Merge Phase ---
-        new_text = Text("2. Conquer: Merge the lists back together in sorted order.", font_size=36).to_edge(DOWN)
-        self.play(FadeOut(status_text), FadeIn(new_text))
-        status_text = new_text
+        self.play(*self.update_status("2. Conquer: Merge the lists back together in sorted order."))
         self.wait(2)
 
-        # Merge [8] and [5] -> [5, 8]
-        new_text = Text("Compare 5 and 8... 5 is smaller.", font_size=36).to_edge(DOWN)
-        self.play(FadeOut(status_text), FadeIn(new_text), Indicate(elem_5), Indicate(elem_8))
-        status_text = new_text
-        
-        # FIX: Animate movement instead of transforming
-        sorted_left_group = VGroup(elem_5, elem_8).arrange(RIGHT, buff=0.5).move_to(left_half.get_center())
-        self.play(
-            elem_5.animate.move_to(sorted_left_group[0].get_center()),
-            elem_8.animate.move_to(sorted_left_group[1].get_center())
-        )
-        self.wait(2)
-        
-        # Merge [2] and [6] -> [2, 6]
-        new_text = Text("Compare 2 and 6... 2 is smaller.", font_size=36).to_edge(DOWN)
-        self.play(FadeOut(status_text), FadeIn(new_text), Indicate(elem_2), Indicate(elem_6))
-        status_text = new_text
-
-        # FIX: Animate movement instead of transforming
-        sorted_right_group = VGroup(elem_2, elem_6).arrange(RIGHT, buff=0.5).move_to(right_half.get_center())
-        self.play(
-            elem_2.animate.move_to(sorted_right_group[0].get_center()),
-            elem_6.animate.move_to(sorted_right_group[1].get_center())
-        )
-        self.wait(2)
-
-        # Final Merge: [5, 8] and [2, 6] -> [2, 5, 6, 8]
-        new_text = Text("Finally, merge the two sorted halves.", font_size=36).to_edge(DOWN)
-        self.play(FadeOut(status_text), FadeIn(new_text))
-        status_text = new_text
-        self.wait(1)
-
-        placeholders = VGroup(*[Square(side_length=1.0, color=BLUE) for _ in range(4)])
-        placeholders.arrange(RIGHT, buff=0.5).move_to(ORIGIN)
-        self.play(DrawBorderThenFill(placeholders))
-
-        # --- Step-by-step comparison ---
-        # Compare 5 and 2 -> move 2
-        new_text = Text("Compare 5 and 2... 2 is smaller.", font_size=36).to_edge(DOWN)
-        self.play(FadeOut(status_text), FadeIn(new_text), Indicate(elem_5), Indicate(elem_2))
-        status_text = new_text
-        self.play(elem_2.animate.move_to(placeholders[0].get_center()))
-        
-        # Compare 5 and 6 -> move 5
-        new_text = Text("Compare 5 and 6... 5 is smaller.", font_size=36).to_edge(DOWN)
-        self.play(FadeOut(status_text), FadeIn(new_text), Indicate(elem_5), Indicate(elem_6))
-        status_text = new_text
-        self.play(elem_5.animate.move_to(placeholders[1].get_center()))
-        
-        # Compare 8 and 6 -> move 6
-        new_text = Text("Compare 8 and 6... 6 is smaller.", font_size=36).to_edge(DOWN)
-        self.play(FadeOut(status_text), FadeIn(new_text), Indicate(elem_8), Indicate(elem_6))
-        status_text = new_text
-        self.play(elem_6.animate.move_to(placeholders[2].get_center()))
-        
-        # 8 is the last remaining element
-        new_text = Text("Move the last element, 8.", font_size=36).to_edge(DOWN)
-        self.play(FadeOut(status_text), FadeIn(new_text), Indicate(elem_8))
-        status_text = new_text
-        self.play(elem_8.animate.move_to(placeholders[3].get_center()))
-
-        self.play(FadeOut(placeholders))
-        self.wait(1)
+        for d in range(depth - 1, -1, -1):
+            merges = sum(1 for lo, hi in trace.levels[d] if hi - lo > 1)
+            message = f"Merge {merges} pair(s) of lists: {trace.comparisons[d]} comparisons."
+            self.play(*self.update_status(message))
+            self.play(self.move_cells(mobjects, trace.orders[d], positions[d]))
+            self.wait(1)
 
         # 4. --- Final Sorted State ---
-        new_text = Text("List is now sorted!", font_size=40).to_edge(DOWN)
-        final_group = VGroup(elem_2, elem_5, elem_6, elem_8)
-        self.play(FadeOut(status_text), FadeIn(new_text))
-        self.play(Wiggle(final_group))
-        self.wait(3)
\ No newline at end of file
+        self.play(*self.update_status("List is now sorted!", font_size=40))
+        self.play(Wiggle(mobjects))
+        self.wait(3)
+
+    def create_cells(self, numbers, side_length):
+        """Creates one cell per number; large lists use colour instead of a label."""
+        if len(numbers) <= self.max_labelled_cells:
+            return VGroup(*[sort_cell(n, side_length) for n in numbers])
+
+        ranks = np.argsort(np.argsort(numbers, kind="stable"), kind="stable")
+        palette = color_gradient([BLUE, RED], len(numbers))
+        return VGroup(*[
+            Square(side_length=side_length, stroke_width=0, fill_color=palette[rank], fill_opacity=1)
+            for rank in ranks
+        ])
+
+    def move_cells(self, cells, order, points):
+        """Returns one animation moving cell ``order[slot]`` onto ``points[slot]`` for every slot."""
+        cells.generate_target()
+        for slot, index in enumerate(order):
+            cells.target[index].move_to(points[slot])
+        return MoveToTarget(cells)
+
+    def update_status(self, message, font_size=36):
+        """Returns the animations that replace the status line with ``message``."""
+        new_text = cached_text(message, font_size=font_size).to_edge(DOWN)
+        animations = [FadeOut(self.status_text), FadeIn(new_text)]
+        self.status_text = new_text
+        return animations
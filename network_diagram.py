@@ -0,0 +1,130 @@
+# network_diagram.py
+
+"""
+Network diagrams backed by NumPy point arrays. All nodes live in one
+mobject and all edges in another, whatever the layer sizes, so even a
+784-128-10 network with 100k edges is only a handful of mobjects.
+"""
+
+import numpy as np
+from manim import *
+
+
+class Segments(VMobject):
+    """
+    Straight segments from ``starts[k]`` to ``ends[k]`` stored as the
+    subpaths of a single VMobject instead of one Line per segment.
+    """
+    def __init__(self, starts=(), ends=(), **kwargs):
+        super().__init__(**kwargs)
+        self.set_segments(starts, ends)
+
+    def set_segments(self, starts, ends):
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        alphas = np.linspace(0, 1, self.n_points_per_curve)[None, :, None]
+        self.set_points((starts[:, None, :] + alphas * (ends - starts)[:, None, :]).reshape(-1, 3))
+        return self
+
+    def get_segments(self):
+        """Returns the current (starts, ends) arrays, after any transforms."""
+        nppc = self.n_points_per_curve
+        return self.points[::nppc], self.points[nppc - 1::nppc]
+
+
+class NetworkDiagram(VGroup):
+    """
+    A fully connected feed-forward network drawn as two mobjects: ``nodes``
+    holds every circle and ``edges`` every connection. Layers taller than
+    ``max_height`` are squeezed to fit.
+
+    Edges are ordered layer by layer, source by source, and described by the
+    ``edge_layer``, ``edge_source`` and ``edge_target`` arrays. Boolean masks
+    over those arrays select edges for flash() and highlight(), which draw
+    into one shared overlay instead of copying the edges.
+    """
+    def __init__(
+        self, layer_sizes, node_radius=0.3, layer_buff=1.5, node_buff=0.5, max_height=6.0,
+        node_color=RED, edge_color=GREY, edge_width=1.5, **kwargs
+    ):
+        self.layer_sizes = list(layer_sizes)
+        tallest = max(self.layer_sizes)
+        squeeze = min(1.0, max_height / (tallest * (2 * node_radius + node_buff) - node_buff))
+        self.node_radius = node_radius * squeeze
+        node_pitch = (2 * node_radius + node_buff) * squeeze
+        layer_pitch = 2 * node_radius + layer_buff
+
+        # --- Node centres, top to bottom within each layer ---
+        self.node_layer = np.repeat(np.arange(len(self.layer_sizes)), self.layer_sizes)
+        first_node = np.concatenate([[0], np.cumsum(self.layer_sizes)])
+        rank = np.arange(len(self.node_layer)) - first_node[self.node_layer]
+        sizes = np.array(self.layer_sizes)[self.node_layer]
+        centers = np.zeros((len(self.node_layer), 3))
+        centers[:, 0] = (self.node_layer - (len(self.layer_sizes) - 1) / 2) * layer_pitch
+        centers[:, 1] = ((sizes - 1) / 2 - rank) * node_pitch
+
+        # --- Edges between consecutive layers ---
+        sources, targets, layers = [], [], []
+        for layer, (n_in, n_out) in enumerate(zip(self.layer_sizes, self.layer_sizes[1:])):
+            grid_in, grid_out = np.meshgrid(np.arange(n_in), np.arange(n_out), indexing="ij")
+            sources.append(first_node[layer] + grid_in.ravel())
+            targets.append(first_node[layer + 1] + grid_out.ravel())
+            layers.append(np.full(n_in * n_out, layer))
+        self.edge_source = np.concatenate(sources) if sources else np.zeros(0, dtype=int)
+        self.edge_target = np.concatenate(targets) if targets else np.zeros(0, dtype=int)
+        self.edge_layer = np.concatenate(layers) if layers else np.zeros(0, dtype=int)
+
+        template = Circle(radius=self.node_radius).points
+        self.nodes = VMobject(color=node_color)
+        self.nodes.set_points((centers[:, None, :] + template[None]).reshape(-1, 3))
+        offset = self.node_radius * RIGHT
+        self.edges = Segments(
+            centers[self.edge_source] + offset, centers[self.edge_target] - offset,
+            color=edge_color, stroke_width=edge_width,
+        )
+        # Flashes and highlights draw here; it is only in the scene while they play
+        self.overlay = Segments(stroke_width=edge_width)
+
+        super().__init__(self.nodes, self.edges, **kwargs)
+
+    def get_node_centers(self):
+        """Returns the (num_nodes, 3) array of node centres, after any transforms."""
+        per_node = len(self.nodes.points) // len(self.node_layer)
+        return self.nodes.points.reshape(len(self.node_layer), per_node, 3).mean(axis=1)
+
+    def _selected_segments(self, mask, reverse):
+        starts, ends = self.edges.get_segments()
+        if mask is not None:
+            starts, ends = starts[mask], ends[mask]
+        return (ends, starts) if reverse else (starts, ends)
+
+    def flash(self, mask=None, color=YELLOW, time_width=0.5, reverse=False, **kwargs):
+        """
+        ShowPassingFlash over the edges selected by ``mask`` (all by default).
+        ``reverse`` runs the flash from the targets back to the sources.
+        """
+        starts, ends = self._selected_segments(mask, reverse)
+        self.overlay.set_stroke(color, self.edges.get_stroke_width())
+
+        def update(overlay, alpha):
+            upper = alpha * (1 + time_width)
+            lower = max(upper - time_width, 0)
+            upper = min(upper, 1)
+            overlay.set_segments(starts + lower * (ends - starts), starts + upper * (ends - starts))
+
+        return UpdateFromAlphaFunc(self.overlay, update, remover=True, **kwargs)
+
+    def highlight(self, mask=None, color=YELLOW, scale_factor=1.2, **kwargs):
+        """Indicate for the edges selected by ``mask``: they grow and change colour, then settle back."""
+        starts, ends = self._selected_segments(mask, False)
+        points = np.vstack([starts, ends])
+        center = (points.min(axis=0) + points.max(axis=0)) / 2 if len(points) else ORIGIN
+        width = self.edges.get_stroke_width()
+
+        def update(overlay, alpha):
+            amount = there_and_back(alpha)
+            scale = interpolate(1, scale_factor, amount)
+            overlay.set_segments(center + scale * (starts - center), center + scale * (ends - center))
+            overlay.set_stroke(color, width, opacity=amount)
+
+        return UpdateFromAlphaFunc(self.overlay, update, remover=True, **kwargs)
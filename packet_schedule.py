@@ -0,0 +1,44 @@
+# packet_schedule.py
+
+"""
+Precomputes where every packet of a pipelined stream is at every tick.
+A packet advances one stage per tick, a new packet may be sent every tick,
+and at most ``window`` packets are unacknowledged at once, like a TCP
+sliding window. Scenes replay the schedule so that every packet that moves
+during a tick is animated in the same play call.
+"""
+
+import numpy as np
+
+
+def pipeline_schedule(num_packets, num_stages, window=None):
+    """
+    Returns an int array of shape (ticks, num_packets) holding the stage of
+    every packet at every tick: -1 before it is sent, 0 .. num_stages - 1
+    while in flight and ``num_stages`` once it has been delivered.
+    """
+    window = num_packets if window is None else max(1, window)
+    start = np.zeros(num_packets, dtype=int)
+    for p in range(1, num_packets):
+        start[p] = start[p - 1] + 1
+        if p >= window:
+            # The window only slides once the packet sent ``window`` earlier is delivered
+            start[p] = max(start[p], start[p - window] + num_stages)
+
+    ticks = start[-1] + num_stages + 1 if num_packets else 0
+    stages = np.arange(ticks)[:, None] - start[None, :]
+    return np.clip(stages, -1, num_stages)
+
+
+def max_in_flight(schedule, num_stages):
+    """
+    The largest number of packets busy at any tick, i.e. how many packet
+    mobjects to pool. A packet delivered during a tick still moves in that
+    tick's play, so it only becomes free for the packets sent after it.
+    """
+    if not len(schedule):
+        return 0
+    in_flight = (schedule >= 0) & (schedule < num_stages)
+    delivering = np.zeros_like(in_flight)
+    delivering[1:] = (schedule[1:] == num_stages) & in_flight[:-1]
+    return int((in_flight | delivering).sum(axis=1).max())
@@ -0,0 +1,320 @@
+# play_cache.py
+
+"""
+Caches the video of every play call under a key built from what the play
+draws, so an unchanged play is reused wherever it ends up in a scene and
+by every scene and developer on the machine.
+
+The key hashes the animations of the play, the state of every mobject in
+the scene, the camera and the output settings. Mobjects are hashed by
+structure, in family order, from their types, arrays and scalar
+attributes, and functions such as rate functions and updaters by their
+code and the values they capture. Nothing depends on object ids or on how many plays came before, so
+inserting a wait near the top of a scene leaves the keys of every later
+play alone.
+
+Played clips are kept in one shared folder, MANIM_PLAY_CACHE or
+<tmp>/manim-play-cache, with group-writable files. Every hit refreshes a
+clip's modification time, and once the folder grows past ``max_bytes``
+the least recently used clips are deleted.
+
+Usage:
+    import play_cache
+    play_cache.enable()   # before the scene renders; render_all.py --play-cache does this
+"""
+
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+import types
+from pathlib import Path
+
+import numpy as np
+
+cache_dir = Path(os.environ.get("MANIM_PLAY_CACHE", Path(tempfile.gettempdir()) / "manim-play-cache"))
+max_bytes = 5 * 2**30
+
+_originals = []
+
+# Attributes that never change what a play looks like, or that hold render buffers
+_IGNORED = {"pixel_array", "pixel_array_to_cairo_context", "background", "original_id", "renderer", "scene"}
+
+
+def _const_key(const):
+    """A constant of a code object, without addresses or set ordering that change between processes."""
+    if isinstance(const, types.CodeType):
+        return _code_key(const)
+    if isinstance(const, tuple):
+        return "(" + ",".join(_const_key(item) for item in const) + ")"
+    if isinstance(const, frozenset):
+        return "frozenset(" + ",".join(sorted(_const_key(item) for item in const)) + ")"
+    return repr(const)
+
+
+def _code_key(code):
+    """Bytecode and constants of ``code``; nested lambdas and comprehensions are keyed the same way."""
+    return f"{code.co_name}:{code.co_code.hex()}:[{','.join(_const_key(const) for const in code.co_consts)}]"
+
+
+def _function_key(function):
+    """Module, name and code of a function, so editing its body changes the key."""
+    code = getattr(function, "__code__", None)
+    key = f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', type(function).__name__)}"
+    if code is None:
+        return key
+    return f"{key}:{_code_key(code)}"
+
+
+class _Hasher:
+    """
+    Feeds values into a digest in a canonical order. Everything reachable is
+    hashed, however deep; objects and mutable containers fed before are
+    hashed by their first-visit index, which also ends cycles.
+    """
+
+    def __init__(self):
+        self.digest = hashlib.blake2b(digest_size=20)
+        self.seen = {}
+
+    def update(self, text):
+        self.digest.update(text.encode())
+
+    def feed(self, value):
+        if value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+            self.update(f"{type(value).__name__}:{value!r};")
+        elif isinstance(value, np.ndarray):
+            if value.dtype == object:
+                self.feed(value.tolist())
+            else:
+                self.update(f"array:{value.dtype}:{value.shape};")
+                self.digest.update(np.ascontiguousarray(value))
+        elif isinstance(value, (types.FunctionType, types.MethodType, types.BuiltinFunctionType, functools.partial)):
+            self.feed_function(value)
+        elif isinstance(value, (type, types.ModuleType)):
+            self.update(f"{type(value).__name__}:{getattr(value, '__module__', '')}.{value.__name__};")
+        elif isinstance(value, (set, frozenset)):
+            # Set order differs between processes, so members are hashed on their own and sorted
+            self.update(f"{type(value).__name__}[{','.join(sorted(_digest(item) for item in value))}]")
+        elif isinstance(value, (list, tuple)):
+            if isinstance(value, list) and self.visited(value):
+                return
+            self.update(f"{type(value).__name__}[")
+            for item in value:
+                self.feed(item)
+            self.update("]")
+        elif isinstance(value, dict):
+            if self.visited(value):
+                return
+            self.update("dict{")
+            for key in sorted(value, key=str):
+                if key not in _IGNORED:
+                    self.update(f"{key}=")
+                    self.feed(value[key])
+            self.update("}")
+        elif hasattr(value, "__dict__") or hasattr(value, "__slots__"):
+            self.feed_object(value)
+        else:
+            self.update(f"{type(value).__qualname__};")
+
+    def visited(self, obj):
+        """Hashes a reference and returns True if ``obj`` was fed before, otherwise records it."""
+        if id(obj) in self.seen:
+            self.update(f"ref:{self.seen[id(obj)][0]};")
+            return True
+        # The object is kept alive with its index, so its id cannot be reused by another one
+        self.seen[id(obj)] = (len(self.seen), obj)
+        return False
+
+    def feed_function(self, function):
+        if self.visited(function):
+            return
+        if isinstance(function, functools.partial):
+            self.update("partial(")
+            self.feed([function.func, list(function.args), dict(function.keywords)])
+            self.update(")")
+            return
+        bound = getattr(function, "__self__", None)
+        function = getattr(function, "__func__", function)
+        self.update(f"function:{_function_key(function)}(")
+        # What a function captures changes what it draws as much as its code,
+        # e.g. the colour and scale in the updaters of NetworkDiagram.highlight
+        for cell in getattr(function, "__closure__", None) or ():
+            try:
+                self.feed(cell.cell_contents)
+            except ValueError:
+                self.update("empty;")  # a cell whose variable is not assigned yet
+        self.feed([getattr(function, "__defaults__", None), getattr(function, "__kwdefaults__", None)])
+        if bound is not None and not isinstance(bound, (type, types.ModuleType)):
+            self.feed(bound)
+        self.update(")")
+
+    def feed_object(self, obj):
+        if self.visited(obj):
+            return
+        self.update(f"{type(obj).__module__}.{type(obj).__qualname__}(")
+        if hasattr(obj, "construct") and hasattr(obj, "renderer"):
+            pass  # a scene captured by a closure; its mobjects are hashed on their own
+        elif hasattr(obj, "get_family") and hasattr(obj, "submobjects"):
+            attributes = {key: value for key, value in _attributes(obj).items() if key != "submobjects"}
+            self.feed(attributes)
+            self.update(f"submobjects:{len(obj.submobjects)}[")
+            for submobject in obj.submobjects:
+                self.feed_object(submobject)
+            self.update("]")
+        else:
+            self.feed(_attributes(obj))
+        self.update(")")
+
+
+def _digest(value):
+    hasher = _Hasher()
+    hasher.feed(value)
+    return hasher.digest.hexdigest()
+
+
+def _attributes(obj):
+    """Instance attributes of ``obj``, from __slots__ for classes like ManimColor that have no __dict__."""
+    if hasattr(obj, "__dict__"):
+        attributes = dict(vars(obj))
+    else:
+        slots = [name for cls in type(obj).__mro__ for name in getattr(cls, "__slots__", ())]
+        attributes = {name: getattr(obj, name) for name in slots if hasattr(obj, name)}
+    return {key: value for key, value in attributes.items() if key not in _IGNORED}
+
+
+def play_key(camera, animations, mobjects):
+    """The structural cache key of a play of ``animations`` over ``mobjects`` seen through ``camera``."""
+    from manim import __version__, config
+
+    hasher = _Hasher()
+    hasher.feed([
+        __version__,
+        str(config.renderer),
+        config.pixel_width,
+        config.pixel_height,
+        config.frame_rate,
+        str(config.background_color),
+        config.movie_file_extension,
+        config.transparent,
+    ])
+    # Only the small camera attributes (frame centre, size, angles) matter, not its buffers
+    hasher.feed({
+        key: value
+        for key, value in vars(camera).items()
+        if key not in _IGNORED and (not isinstance(value, np.ndarray) or value.size <= 16)
+    })
+    hasher.feed(list(animations))
+    hasher.feed(list(mobjects))
+    return "play_" + hasher.digest.hexdigest()
+
+
+def _hash_from_play_call(get_hash_from_play_call):
+    def wrapper(scene, camera, animations, mobjects):
+        return play_key(camera, animations, mobjects)
+    return wrapper
+
+
+def _shared_path(key):
+    from manim import config
+
+    return cache_dir / f"{key}{config.movie_file_extension}"
+
+
+def _is_already_cached(is_already_cached):
+    def wrapper(self, hash_invocation):
+        if is_already_cached(self, hash_invocation):
+            return True
+        shared = _shared_path(hash_invocation)
+        if not hasattr(self, "partial_movie_directory") or not shared.is_file():
+            return False
+        local = self.partial_movie_directory / shared.name
+        try:
+            try:
+                os.link(shared, local)
+            except FileNotFoundError:
+                raise
+            except OSError:
+                shutil.copyfile(shared, local)
+        except FileNotFoundError:
+            return False  # another render evicted it since the check above
+        try:
+            # Refreshing the modification time marks the clip as recently used
+            os.utime(shared)
+        except FileNotFoundError:
+            pass
+        return True
+    return wrapper
+
+
+def _close_partial_movie_stream(close_partial_movie_stream):
+    def wrapper(self):
+        close_partial_movie_stream(self)
+        store(Path(self.partial_movie_file_path))
+    return wrapper
+
+
+def store(path):
+    """Adds the partial movie at ``path`` to the shared cache, then evicts down to ``max_bytes``."""
+    shared = cache_dir / path.name
+    if shared.is_file() or not path.name.startswith("play_"):
+        return
+    if not cache_dir.is_dir():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            # mkdir applies the umask; the folder is shared by everyone in the group
+            os.chmod(cache_dir, 0o2775)
+        except OSError:
+            pass  # created by someone else first
+    tmp = cache_dir / f".{path.name}.{os.getpid()}.tmp"
+    shutil.copyfile(path, tmp)
+    os.chmod(tmp, 0o664)
+    tmp.replace(shared)
+    evict()
+
+
+def evict(limit=None):
+    """Deletes the least recently used clips until the cache holds at most ``limit`` bytes."""
+    limit = max_bytes if limit is None else limit
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and not entry.name.startswith("."):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # another render evicted it first
+        total -= size
+
+
+def _patch(owner, name, make_wrapper):
+    original = getattr(owner, name)
+    _originals.append((owner, name, original))
+    setattr(owner, name, functools.wraps(original)(make_wrapper(original)))
+
+
+def enable():
+    """Keys every play structurally and shares its clip through the cache folder."""
+    if _originals:
+        return
+    import manim.renderer.cairo_renderer as cairo_renderer
+    import manim.utils.caching as caching
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    # Both renderers imported the hash function by name
+    _patch(cairo_renderer, "get_hash_from_play_call", _hash_from_play_call)
+    _patch(caching, "get_hash_from_play_call", _hash_from_play_call)
+    _patch(SceneFileWriter, "is_already_cached", _is_already_cached)
+    _patch(SceneFileWriter, "close_partial_movie_stream", _close_partial_movie_stream)
+
+
+def disable():
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
@@ -0,0 +1,197 @@
+# play_profiler.py
+
+"""
+Opt-in profiler that records every play and wait call of a render and
+saves them as a Chrome trace, which chrome://tracing and ui.perfetto.dev
+can open.
+
+Each play call becomes one span named after the scene method and line that
+made it. Its arguments list the animation types, the size of the animated
+mobject families, the frame count and the time spent in each phase:
+
+    interpolate  Scene.update_to_time, moving the mobjects to time t
+    rasterize    the renderer drawing a frame
+    write        handing frames to the file writer and closing the partial movie
+    encode       the writer thread encoding frames (shown on its own track)
+
+Every individual phase call also gets its own span, nested under its play.
+Nothing is patched until enable() is called, so a disabled profiler costs
+nothing and can stay wired into the render scripts.
+
+Usage:
+    python play_profiler.py merge_sort.py MergeSortScene -q l
+    python render_all.py --profile
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+PHASES = ("interpolate", "rasterize", "write", "encode")
+
+_events = None
+_current = None  # per-phase totals of the play call in progress
+_originals = []
+
+
+def _now():
+    return time.perf_counter_ns() / 1000  # trace timestamps are in microseconds
+
+
+def _span(name, category, start, args=None):
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start,
+        "dur": _now() - start,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = args
+    _events.append(event)
+    return event["dur"]
+
+
+def _patch(owner, name, make_wrapper):
+    original = getattr(owner, name)
+    _originals.append((owner, name, original))
+    setattr(owner, name, functools.wraps(original)(make_wrapper(original)))
+
+
+def _phase(phase):
+    """Wrapper factory timing a method as one call of ``phase``."""
+    def make_wrapper(method):
+        def wrapper(*args, **kwargs):
+            start = _now()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                duration = _span(phase, phase, start)
+                if _current is not None:
+                    _current[phase] += duration
+        return wrapper
+    return make_wrapper
+
+
+def _caller():
+    """The innermost frame outside manim and this module, i.e. the scene code that called play."""
+    import manim
+
+    skipped = (str(Path(manim.__file__).parent), __file__)
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename.startswith(skipped):
+        frame = frame.f_back
+    if frame is None:
+        return "?", "?", 0
+    return frame.f_code.co_name, Path(frame.f_code.co_filename).name, frame.f_lineno
+
+
+def _play(play):
+    def wrapper(scene, *args, **kwargs):
+        global _current
+        if _current is not None:
+            return play(scene, *args, **kwargs)
+
+        method, filename, line = _caller()
+        _current = dict.fromkeys(PHASES, 0.0)
+        _current["frames"] = 0
+        start = _now()
+        try:
+            return play(scene, *args, **kwargs)
+        finally:
+            totals, _current = _current, None
+            animations = getattr(scene, "animations", None) or []
+            _span(f"{method}:{line}", "play", start, {
+                "method": method,
+                "file": filename,
+                "line": line,
+                "animations": [type(animation).__name__ for animation in animations],
+                "family_size": sum(
+                    len(animation.mobject.get_family())
+                    for animation in animations
+                    if getattr(animation, "mobject", None) is not None
+                ),
+                "frames": totals.pop("frames"),
+                **{f"{phase}_ms": round(total / 1000, 3) for phase, total in totals.items()},
+            })
+    return wrapper
+
+
+def _count_frames(write_frame):
+    def wrapper(self, frame_or_renderer, num_frames=1):
+        if _current is not None:
+            _current["frames"] += num_frames
+        return write_frame(self, frame_or_renderer, num_frames)
+    return wrapper
+
+
+def enable():
+    """Starts recording. Patches manim's Scene, renderers and file writer."""
+    global _events
+    if _events is not None:
+        return
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.renderer.opengl_renderer import OpenGLRenderer
+    from manim.scene.scene import Scene
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    _events = []
+    _patch(Scene, "play", _play)
+    _patch(Scene, "update_to_time", _phase("interpolate"))
+    _patch(CairoRenderer, "update_frame", _phase("rasterize"))
+    _patch(OpenGLRenderer, "update_frame", _phase("rasterize"))
+    # Frames are counted outside the timing so the count covers frozen frames too
+    _patch(SceneFileWriter, "write_frame", _phase("write"))
+    _patch(SceneFileWriter, "write_frame", _count_frames)
+    _patch(SceneFileWriter, "end_animation", _phase("write"))
+    _patch(SceneFileWriter, "encode_and_write_frame", _phase("encode"))
+
+
+def disable():
+    """Stops recording and restores the original methods."""
+    global _events, _current
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+    _events, _current = None, None
+
+
+def write(path):
+    """Saves everything recorded so far as a Chrome trace at ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    threads = {event["tid"] for event in _events}
+    names = [
+        {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+         "args": {"name": "main" if tid == threading.main_thread().ident else "writer"}}
+        for tid in threads
+    ]
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"traceEvents": names + _events, "displayTimeUnit": "ms"}), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def main(argv=None):
+    from render_all import QUALITIES, SceneJob, render_scene
+
+    parser = argparse.ArgumentParser(description="Render one scene and save a Chrome trace of its play calls.")
+    parser.add_argument("file", type=Path)
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    args = parser.parse_args(argv)
+
+    settings = {"quality": QUALITIES[args.quality], "disable_caching": True}
+    render_scene(SceneJob(args.file.resolve(), args.scene, settings, prewarm_tex=False, profile=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
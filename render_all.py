@@ -0,0 +1,373 @@
+# render_all.py
+
+"""
+Discovers every Scene class in the repository and renders them in parallel,
+one worker process per scene. A scene is skipped when the hash of its source
+file, the local modules it imports and the render settings matches the last
+successful render and the video is still on disk.
+
+Usage:
+    python render_all.py                # render everything that changed
+    python render_all.py -q h -j 4      # high quality, four workers
+    python render_all.py MergeSortScene # only the named scene(s)
+    python render_all.py --list         # show what would be rendered
+
+Each scene renders with the renderer chosen for this machine by
+calibrate_renderers.py, or else with its ``preferred_renderer`` class
+attribute, or else with manim's default.
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import platform
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+CALIBRATION = "renderer_calibration.json"  # written to the media folder by calibrate_renderers.py
+
+SKIP_DIRS = {"media", "__pycache__", "venv", ".venv", ".git", ".tox", ".nox"}
+
+# prewarm_tex compiles the scene's TeX strings in parallel before rendering (see tex_prewarm.py);
+# profile saves a Chrome trace of every play call under media/profiles (see play_profiler.py);
+# dedup_frames reuses the previous frame whenever nothing visible changed (see frame_dedup.py);
+# static_layers rasterizes mobjects that do not move once per play or less (see static_layers.py);
+# stream encodes the scene as one video instead of one partial file per play (see stream_writer.py);
+# play_cache reuses partial files of unchanged plays across scenes and renders (see play_cache.py)
+SceneJob = namedtuple(
+    "SceneJob",
+    ["path", "scene", "settings", "prewarm_tex", "profile", "dedup_frames", "static_layers", "stream", "play_cache"],
+    defaults=[True, False, True, True, True, False],
+)
+
+
+def find_python_files(root=REPO_ROOT):
+    """Yields every .py file under ``root`` outside of hidden and build folders."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith("."))
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                yield Path(dirpath) / filename
+
+
+def scene_classes_in(path):
+    """
+    Returns the names of classes in ``path`` that derive from a *Scene base,
+    or from a scene class defined earlier in the same file.
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    names = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in node.bases:
+            base_name = base.id if isinstance(base, ast.Name) else getattr(base, "attr", "")
+            if base_name.endswith("Scene") or base_name in names:
+                names.append(node.name)
+                break
+    return names
+
+
+def local_dependencies(path, seen=None):
+    """
+    Returns ``path`` and every repository module it imports, recursively.
+    Modules are looked up next to the importing file and at the repo root,
+    the same places the scripts can import them from.
+    """
+    seen = set() if seen is None else seen
+    if path in seen:
+        return seen
+    seen.add(path)
+
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules = [node.module]
+        else:
+            continue
+        for module in modules:
+            relative = Path(*module.split(".")).with_suffix(".py")
+            for folder in (path.parent, REPO_ROOT):
+                candidate = (folder / relative).resolve()
+                if candidate.is_file():
+                    local_dependencies(candidate, seen)
+                    break
+    return seen
+
+
+def manim_version():
+    try:
+        return importlib.metadata.version("manim")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# The render pipeline modules each SceneJob flag switches on
+PIPELINE_MODULES = {
+    "dedup_frames": "frame_dedup.py",
+    "static_layers": "static_layers.py",
+    "stream": "stream_writer.py",
+    "play_cache": "play_cache.py",
+}
+
+
+def scene_hash(job):
+    """
+    Hashes the scene name, its source, its local dependencies, the render
+    settings, the job flags and the source of the pipeline modules they enable.
+    """
+    digest = hashlib.sha256()
+    digest.update(job.scene.encode())
+    digest.update(manim_version().encode())
+    digest.update(json.dumps(job.settings, sort_keys=True).encode())
+    # Profiling never reuses a render, see render_jobs()
+    flags = {name: value for name, value in job._asdict().items() if name not in ("path", "scene", "settings", "profile")}
+    digest.update(json.dumps(flags, sort_keys=True).encode())
+    dependencies = local_dependencies(job.path.resolve())
+    for flag, module in PIPELINE_MODULES.items():
+        if flags[flag]:
+            local_dependencies((REPO_ROOT / module).resolve(), dependencies)
+    for dependency in sorted(dependencies):
+        digest.update(str(dependency.relative_to(REPO_ROOT)).encode())
+        digest.update(dependency.read_bytes())
+    return digest.hexdigest()
+
+
+def load_module(path):
+    """Imports a scene file the same way the manim CLI does."""
+    module_name = ".".join(path.relative_to(REPO_ROOT).with_suffix("").parts)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    sys.path.insert(0, str(path.parent))
+    spec.loader.exec_module(module)
+    return module
+
+
+def host_environment():
+    """What a renderer calibration is only valid for."""
+    return {"host": platform.node(), "manim": manim_version()}
+
+
+def calibrated(jobs, path):
+    """
+    Sets the renderer of every job that the calibration at ``path`` has a
+    choice for. Calibrations made on another host or manim version are ignored.
+    """
+    calibration = load_manifest(path)
+    if not calibration:
+        return jobs
+    if calibration.get("environment") != host_environment():
+        print(f"Ignoring {path}: it was calibrated with {calibration.get('environment')}.")
+        return jobs
+    scenes = calibration.get("scenes", {})
+    return [
+        job._replace(settings=dict(job.settings, renderer=scenes[job_key(job)]["renderer"]))
+        if job_key(job) in scenes and "renderer" not in job.settings
+        else job
+        for job in jobs
+    ]
+
+
+def apply_renderer(scene_class, settings):
+    """
+    Switches manim to ``scene_class.preferred_renderer`` unless ``settings``
+    already pick a renderer. Call inside the job's tempconfig, so the change
+    ends with it and never leaks into another scene.
+    """
+    from manim import config
+
+    preferred = getattr(scene_class, "preferred_renderer", None)
+    if preferred and "renderer" not in settings:
+        config.renderer = preferred
+
+
+def render_scene(job):
+    """
+    Worker entry point. Renders one scene and returns the path of its video.
+    Every worker process renders a single scene, so module-level config
+    changes in one scene file cannot leak into another.
+    """
+    from manim import config, tempconfig
+
+    if job.dedup_frames:
+        import frame_dedup
+
+        frame_dedup.enable()
+    if job.static_layers:
+        import static_layers
+
+        static_layers.enable()
+    if job.stream:
+        import stream_writer
+
+        stream_writer.enable()
+    if job.play_cache:
+        import play_cache
+
+        play_cache.enable()
+    with tempconfig(dict(job.settings, input_file=str(job.path))):
+        scene_class = getattr(load_module(job.path), job.scene)
+        apply_renderer(scene_class, job.settings)
+        if job.prewarm_tex:
+            from tex_prewarm import prewarm_scene
+
+            prewarm_scene(scene_class)
+        if job.profile:
+            import play_profiler
+
+            play_profiler.enable()
+        scene = scene_class()
+        scene.render()
+        if job.profile:
+            trace = play_profiler.write(config.get_dir("media_dir") / "profiles" / f"{job.scene}.trace.json")
+            play_profiler.disable()
+            print(f"[trace] {job.scene} -> {trace}")
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def collect_jobs(
+    settings,
+    only=(),
+    prewarm_tex=True,
+    profile=False,
+    dedup_frames=True,
+    static_layers=True,
+    stream=True,
+    play_cache=False,
+):
+    """Builds a render job for every discovered scene, optionally filtered by name."""
+    jobs = []
+    for path in find_python_files():
+        if path.resolve() == Path(__file__).resolve():
+            continue
+        for scene in scene_classes_in(path):
+            if not only or scene in only:
+                jobs.append(
+                    SceneJob(
+                        path.resolve(), scene, settings, prewarm_tex, profile, dedup_frames, static_layers, stream, play_cache
+                    )
+                )
+    return jobs
+
+
+def job_key(job):
+    return f"{job.path.relative_to(REPO_ROOT)}:{job.scene}"
+
+
+def load_manifest(path):
+    if path.is_file():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {}
+
+
+def save_manifest(path, manifest):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def render_jobs(jobs, manifest_path, workers=None, force=False):
+    """
+    Renders every job whose hash is not already recorded in the manifest.
+    Returns the keys of the scenes that failed.
+    """
+    manifest = load_manifest(manifest_path)
+    pending = []
+    for job in jobs:
+        key, digest = job_key(job), scene_hash(job)
+        entry = manifest.get(key, {})
+        # A profiled job has to render to write its trace
+        if not force and not job.profile and entry.get("hash") == digest and Path(entry.get("output", "")).is_file():
+            print(f"[skip] {key}")
+            continue
+        pending.append((job, key, digest))
+
+    if not pending:
+        return []
+
+    failed = []
+    # "spawn" gives every scene a fresh interpreter and manim config
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = {pool.submit(render_scene, job): (key, digest) for job, key, digest in pending}
+        for future in as_completed(futures):
+            key, digest = futures[future]
+            try:
+                output = future.result()
+            except Exception as error:
+                print(f"[fail] {key}: {error!r}")
+                failed.append(key)
+                continue
+            manifest[key] = {"hash": digest, "output": output}
+            save_manifest(manifest_path, manifest)
+            print(f"[done] {key} -> {output}")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every scene in the repository in parallel.")
+    parser.add_argument("scenes", nargs="*", help="only render these scene classes")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--media-dir", default=str(REPO_ROOT / "media"))
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and render everything")
+    parser.add_argument("--list", action="store_true", help="list the discovered scenes and exit")
+    parser.add_argument("--no-prewarm-tex", action="store_true", help="compile TeX lazily during the render")
+    parser.add_argument("--profile", action="store_true", help="save a Chrome trace of every play call")
+    parser.add_argument("--no-dedup", action="store_true", help="rasterize every frame, even unchanged ones")
+    parser.add_argument("--no-layers", action="store_true", help="redraw static mobjects every frame")
+    parser.add_argument(
+        "--partial-files", action="store_true", help="write and cache one partial movie per play, then concatenate"
+    )
+    parser.add_argument(
+        "--play-cache", action="store_true", help="share partial movies of unchanged plays (implies --partial-files)"
+    )
+    args = parser.parse_args(argv)
+
+    settings = {"quality": QUALITIES[args.quality], "media_dir": args.media_dir}
+    jobs = collect_jobs(
+        settings,
+        set(args.scenes),
+        not args.no_prewarm_tex,
+        args.profile,
+        not args.no_dedup,
+        not args.no_layers,
+        not (args.partial_files or args.play_cache),
+        args.play_cache,
+    )
+    jobs = calibrated(jobs, Path(args.media_dir) / CALIBRATION)
+    if args.list:
+        for job in jobs:
+            print(job_key(job))
+        return 0
+
+    failed = render_jobs(jobs, Path(args.media_dir) / "render_manifest.json", args.jobs, args.force)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
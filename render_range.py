@@ -0,0 +1,162 @@
+# render_range.py
+
+"""
+Renders only part of a scene: a time window or one named section.
+
+Everything before the window still runs, so the scene reaches the right
+state, but those plays are skipped the way manim skips animations: each
+one jumps straight to its end state, and nothing is rasterized or encoded.
+TeX built on the way comes from manim's Tex folder after the first render
+and repeated text from text_cache.py, so the skipped part costs little
+more than building its mobjects. Plays that straddle the edges of the
+window only render the frames inside it (a still wait is written whole),
+and the scene stops at the end of the window.
+
+A named section uses the scene's ``sections`` list (see scene_sections.py);
+a time window works for any scene.
+
+Usage:
+    python render_range.py merge_sort.py MergeSortScene --start 170
+    python render_range.py merge_sort.py MergeSortScene --start 60 --end 75 -q h
+    python render_range.py manim_osi_layer.py OSITraversal --section show_conclusion
+"""
+
+import argparse
+import functools
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from render_all import CALIBRATION, QUALITIES, REPO_ROOT, SceneJob, calibrated, render_scene
+
+# (start, end) in scene seconds; end None renders to the end of the scene
+_window = None
+_originals = []
+
+
+def _play(play):
+    def wrapper(self, *args, **kwargs):
+        from manim.utils.exceptions import EndSceneEarlyException
+
+        start, end = _window
+        options = {key: value for key, value in kwargs.items() if not key.startswith("subcaption")}
+        # Compiled once here for the duration; play() accepts the compiled animations unchanged
+        animations = self.compile_animations(*args, **options)
+        play_start = getattr(self, "_window_clock", 0.0)
+        duration = self.get_run_time(animations)
+        if end is not None and play_start >= end:
+            raise EndSceneEarlyException()
+
+        self._window_offset = play_start
+        self._window_dropped = 0.0
+        self.renderer._before_window = play_start + duration <= start
+        renderer_start = self.renderer.time
+        try:
+            return play(self, *animations, **kwargs)
+        finally:
+            # The time the renderer actually advanced, so a wait that its stop condition ends
+            # early does not shift the window; Cairo only counts the frames it wrote
+            self._window_clock = play_start + self.renderer.time - renderer_start + self._window_dropped
+    return wrapper
+
+
+def _update_skipping_status(update_skipping_status):
+    def wrapper(self):
+        update_skipping_status(self)
+        if getattr(self, "_before_window", False):
+            self.skip_animations = True
+    return wrapper
+
+
+def _get_time_progression(get_time_progression):
+    def wrapper(self, run_time, *args, **kwargs):
+        from manim.renderer.cairo_renderer import CairoRenderer
+
+        progression = get_time_progression(self, run_time, *args, **kwargs)
+        if self.renderer.skip_animations:
+            return progression
+        # Only the frames of a straddling play that fall inside the window are rendered
+        start, end = _window
+        times = getattr(self, "_window_offset", 0.0) + np.asarray(progression.iterable)
+        keep = (times >= start) & (times < end if end is not None else True)
+        if isinstance(self.renderer, CairoRenderer):
+            self._window_dropped = np.count_nonzero(times < start) / self.camera.frame_rate
+        progression.iterable = np.asarray(progression.iterable)[keep]
+        progression.total = int(keep.sum())
+        return progression
+    return wrapper
+
+
+def _patch(owner, name, make_wrapper):
+    original = getattr(owner, name)
+    _originals.append((owner, name, original))
+    setattr(owner, name, functools.wraps(original)(make_wrapper(original)))
+
+
+def enable(start, end=None):
+    """Limits every following render to scene times in [start, end)."""
+    global _window
+    _window = (start, end)
+    if _originals:
+        return
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.renderer.opengl_renderer import OpenGLRenderer
+    from manim.scene.scene import Scene
+
+    _patch(Scene, "play", _play)
+    _patch(Scene, "get_time_progression", _get_time_progression)
+    _patch(CairoRenderer, "update_skipping_status", _update_skipping_status)
+    _patch(OpenGLRenderer, "update_skipping_status", _update_skipping_status)
+
+
+def disable():
+    global _window
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+    _window = None
+
+
+def range_label(start=None, end=None, section=None):
+    if section is not None:
+        return section
+    return f"{start:g}s-{end:g}s" if end is not None else f"{start:g}s-end"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a time window or one section of a scene.")
+    parser.add_argument("file", help="scene file, e.g. merge_sort.py")
+    parser.add_argument("scene", help="scene class, e.g. MergeSortScene")
+    window = parser.add_mutually_exclusive_group(required=True)
+    window.add_argument("--start", type=float, help="first scene second to render")
+    window.add_argument("--section", help="name of the section to render")
+    parser.add_argument("--end", type=float, help="scene second to stop at (default: the end)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("--media-dir", default=str(REPO_ROOT / "media"))
+    args = parser.parse_args(argv)
+    if args.end is not None and args.start is None:
+        parser.error("--end needs --start")
+
+    label = range_label(args.start, args.end, args.section)
+    settings = {
+        "quality": QUALITIES[args.quality],
+        "media_dir": args.media_dir,
+        "output_file": f"{args.scene}_{label}",
+    }
+    if args.section is not None:
+        import scene_sections
+
+        scene_sections.only_section = args.section
+    else:
+        enable(args.start, args.end)
+
+    # TeX prewarming would run all of construct once more; the TeX cache is warm after a full render anyway
+    job = SceneJob(Path(args.file).resolve(), args.scene, settings, prewarm_tex=False)
+    job = calibrated([job], Path(args.media_dir) / CALIBRATION)[0]
+    print(render_scene(job))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
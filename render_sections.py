@@ -0,0 +1,147 @@
+# render_sections.py
+
+"""
+Renders the sections of one long scene in parallel and joins the results.
+
+The scene has to list its phases in a ``sections`` class attribute and run
+them through scene_sections.run_sections (see OSITraversal). Each worker
+replays the earlier phases with animations skipped, so it starts from the
+same scene state, then renders its own phase. The section videos are
+joined by copying their packets, so nothing is re-encoded.
+
+Usage:
+    python render_sections.py manim_osi_layer.py OSITraversal -q h
+"""
+
+import argparse
+import ast
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from render_all import QUALITIES, REPO_ROOT, SceneJob, apply_renderer, load_module
+
+
+def scene_sections(path, scene):
+    """Reads the ``sections`` list of ``scene`` from its source without importing it."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == scene:
+            for statement in node.body:
+                if (
+                    isinstance(statement, ast.Assign)
+                    and any(getattr(target, "id", None) == "sections" for target in statement.targets)
+                ):
+                    return ast.literal_eval(statement.value)
+            raise ValueError(f"{scene} in {path} does not define a sections list")
+    raise ValueError(f"{scene} not found in {path}")
+
+
+def section_settings(job, index, section):
+    """Per-section output names, so concurrent workers never share a file."""
+    return dict(
+        job.settings,
+        input_file=str(job.path),
+        output_file=f"{job.scene}_{index:02d}_{section}",
+        partial_movie_dir="{video_dir}/partial_movie_files/{scene_name}/" + section,
+    )
+
+
+def render_section(job, index, section):
+    """Worker entry point. Renders a single section and returns its video path."""
+    from manim import tempconfig
+
+    import scene_sections
+
+    scene_sections.only_section = section
+    if job.dedup_frames:
+        import frame_dedup
+
+        frame_dedup.enable()
+    if job.static_layers:
+        import static_layers
+
+        static_layers.enable()
+    if job.stream:
+        import stream_writer
+
+        stream_writer.enable()
+    if job.play_cache:
+        import play_cache
+
+        play_cache.enable()
+    with tempconfig(section_settings(job, index, section)):
+        scene_class = getattr(load_module(job.path), job.scene)
+        apply_renderer(scene_class, job.settings)
+        scene = scene_class()
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def concat_videos(inputs, output):
+    """
+    Joins videos with identical stream settings by copying their packets
+    through ffmpeg's concat demuxer, the same way manim joins partial movies.
+    """
+    import av
+
+    file_list = Path(output).with_suffix(".txt")
+    with file_list.open("w", encoding="utf-8") as fp:
+        for path in inputs:
+            fp.write(f"file 'file:{Path(path).as_posix()}'\n")
+
+    input_container = av.open(str(file_list), options={"safe": "0", "an": "1"}, format="concat")
+    input_stream = input_container.streams.video[0]
+    output_container = av.open(str(output), mode="w")
+    output_stream = output_container.add_stream(template=input_stream)
+    for packet in input_container.demux(input_stream):
+        # Skip the flushing packets that demux generates
+        if packet.dts is None:
+            continue
+        # Let libav recompute dts, the chunks each start again from zero
+        packet.dts = None
+        packet.stream = output_stream
+        output_container.mux(packet)
+    input_container.close()
+    output_container.close()
+    file_list.unlink()
+
+
+def render_sections(job, workers=None):
+    """Renders every section of ``job`` concurrently and returns the joined video path."""
+    sections = scene_sections(job.path, job.scene)
+    with ProcessPoolExecutor(
+        max_workers=workers or min(len(sections), os.cpu_count()),
+        mp_context=get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = [
+            pool.submit(render_section, job, index, section)
+            for index, section in enumerate(sections)
+        ]
+        chunks = [future.result() for future in futures]
+
+    output = Path(chunks[0]).with_name(f"{job.scene}.mp4")
+    concat_videos(chunks, output)
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the sections of one scene in parallel.")
+    parser.add_argument("file", help="scene file, e.g. manim_osi_layer.py")
+    parser.add_argument("scene", help="scene class, e.g. OSITraversal")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per section)")
+    parser.add_argument("--media-dir", default=str(REPO_ROOT / "media"))
+    args = parser.parse_args(argv)
+
+    settings = {"quality": QUALITIES[args.quality], "media_dir": args.media_dir}
+    job = SceneJob(Path(args.file).resolve(), args.scene, settings)
+    print(render_sections(job, args.jobs))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
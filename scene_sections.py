@@ -0,0 +1,31 @@
+# scene_sections.py
+
+"""
+Runs a scene made of independent phases as one manim section per phase.
+render_sections.py uses this to render every phase in its own process.
+"""
+
+from manim.utils.exceptions import EndSceneEarlyException
+
+# Name of the only section to render. Set by the render_sections.py workers;
+# None renders the whole scene as usual.
+only_section = None
+
+
+def run_sections(scene, names):
+    """
+    Calls ``scene.<name>()`` for every name, each inside its own section.
+
+    When ``only_section`` is set, the phases before it still run so the scene
+    reaches the right state, but with animations skipped (no frames are
+    rasterized or encoded). The scene ends as soon as that phase is done.
+    """
+    if only_section is not None and only_section not in names:
+        raise ValueError(f"{type(scene).__name__} has no section named {only_section!r}")
+
+    for name in names:
+        skip = only_section is not None and name != only_section
+        scene.next_section(name, skip_animations=skip)
+        getattr(scene, name)()
+        if name == only_section:
+            raise EndSceneEarlyException()
@@ -0,0 +1,147 @@
+# sort_engine.py
+
+"""
+Runs sorting algorithms once and records what they did as a flat event
+stream. Scenes replay the stream instead of sorting and animating at the
+same time, which lets them merge many small steps into a few play calls.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Event kinds
+LINE = "line"        # the code pointer moves to line ``i``
+COMPARE = "compare"  # elements at indices ``i`` and ``j`` are compared
+SWAP = "swap"        # elements at indices ``i`` and ``j`` are swapped
+SORTED = "sorted"    # the element at index ``i`` is in its final place
+
+SortEvent = namedtuple("SortEvent", ["kind", "i", "j"], defaults=[None])
+
+# levels[d] lists the (lo, hi) slot ranges at recursion depth d, orders[d] is
+# the element index in every slot once depth d is merged, and comparisons[d]
+# counts the comparisons made while merging depth d.
+MergeTrace = namedtuple("MergeTrace", ["levels", "orders", "comparisons"])
+
+
+def bubble_sort_events(values):
+    """
+    Bubble sorts a copy of ``values`` and returns the list of events.
+    Line numbers refer to the code block shown in BubbleSortWithCodeScene.
+    """
+    arr = list(values)
+    n = len(arr)
+    events = [SortEvent(LINE, 1)]
+
+    for i in range(n - 1):
+        events.append(SortEvent(LINE, 2))
+        for j in range(n - i - 1):
+            events.append(SortEvent(LINE, 3))
+            events.append(SortEvent(LINE, 4))
+            events.append(SortEvent(COMPARE, j, j + 1))
+            if arr[j] > arr[j + 1]:
+                events.append(SortEvent(LINE, 5))
+                events.append(SortEvent(SWAP, j, j + 1))
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+        events.append(SortEvent(SORTED, n - i - 1))
+
+    if n:
+        events.append(SortEvent(SORTED, 0))
+    return events
+
+
+def group_steps(events):
+    """
+    Splits an event stream into steps, one per play call of the detailed
+    animation. A compare belongs to the code line that precedes it; every
+    other event starts a step of its own.
+    """
+    steps = []
+    for event in events:
+        if event.kind == COMPARE and steps and steps[-1][-1].kind == LINE:
+            steps[-1].append(event)
+        else:
+            steps.append([event])
+    return steps
+
+
+def batch_steps(steps, max_plays):
+    """
+    Merges consecutive steps into at most ``max_plays`` batches of equal size.
+    Returns the batch size together with the batches.
+    """
+    size = max(1, -(-len(steps) // max(1, max_plays)))
+    return size, [steps[k:k + size] for k in range(0, len(steps), size)]
+
+
+def merge_sort_trace(values):
+    """
+    Merge sorts ``values`` top-down and records the state of every recursion
+    level. Single-element ranges are carried down unchanged, so every level
+    covers all n slots.
+    """
+    values = list(values)
+    n = len(values)
+
+    # --- Divide ---
+    levels = [[(0, n)]]
+    while any(hi - lo > 1 for lo, hi in levels[-1]):
+        next_level = []
+        for lo, hi in levels[-1]:
+            if hi - lo > 1:
+                mid = (lo + hi) // 2
+                next_level += [(lo, mid), (mid, hi)]
+            else:
+                next_level.append((lo, hi))
+        levels.append(next_level)
+
+    # --- Conquer & Merge ---
+    depth = len(levels) - 1
+    orders = np.empty((depth + 1, n), dtype=int)
+    orders[depth] = np.arange(n)
+    comparisons = [0] * (depth + 1)
+    for d in range(depth - 1, -1, -1):
+        below = orders[d + 1]
+        orders[d] = below
+        for lo, hi in levels[d]:
+            if hi - lo < 2:
+                continue
+            mid = (lo + hi) // 2
+            left, right = list(below[lo:mid]), list(below[mid:hi])
+            merged = []
+            while left and right:
+                comparisons[d] += 1
+                # Ties take the left element, which keeps the sort stable
+                if values[right[0]] < values[left[0]]:
+                    merged.append(right.pop(0))
+                else:
+                    merged.append(left.pop(0))
+            orders[d, lo:hi] = merged + left + right
+
+    return MergeTrace(levels, orders, comparisons)
+
+
+def merge_sort_layout(levels, width=12.0, top=1.5, bottom=-2.0, gap_ratio=0.5):
+    """
+    Computes the slot centres for every recursion level at once.
+
+    Returns an array of shape (depth + 1, n, 3) and the side length that
+    keeps neighbouring cells and rows from overlapping. Ranges are separated
+    by ``gap_ratio`` of a cell pitch.
+    """
+    n = levels[0][0][1]
+    depth = len(levels) - 1
+    max_gaps = max(len(level) for level in levels) - 1
+    pitch = min(1.5, width / max(n + max_gaps * gap_ratio, 1))
+    row_step = min(1.5, (top - bottom) / depth) if depth else 0.0
+
+    positions = np.zeros((depth + 1, n, 3))
+    for d, level in enumerate(levels):
+        # Index of the range each slot belongs to
+        segment = np.repeat(np.arange(len(level)), [hi - lo for lo, hi in level])
+        x = np.arange(n) * pitch + segment * gap_ratio * pitch
+        positions[d, :, 0] = x - (x.min() + x.max()) / 2 if n else x
+        positions[d, :, 1] = top - d * row_step
+
+    side = min(1.0, pitch * 2 / 3, row_step * 0.7) if depth else min(1.0, pitch * 2 / 3)
+    return positions, side
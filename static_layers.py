@@ -0,0 +1,236 @@
+# static_layers.py
+
+"""
+Rasterizes the parts of a scene that do not move once per play, or once
+for several plays, instead of once per frame.
+
+The Cairo renderer already paints the mobjects that come before the first
+moving one into a static background, but everything drawn after that point
+is redrawn every frame, and the background itself is rasterized again at
+the start of every play. With layers enabled:
+
+- Static mobjects drawn on top of all moving ones (labels, a code block or
+  an OSI stack added late) are rasterized once into a transparent overlay
+  that is composited over every frame.
+- The background and overlay are kept, keyed by a fingerprint of what they
+  contain, so the next play with the same static content reuses them.
+- The OpenGL renderer, which redraws every mobject every frame, gets the
+  same background layer in an offscreen framebuffer that is copied into
+  the frame before the moving mobjects are drawn.
+
+Mobjects count as moving when they are animated, have updaters or are in
+the foreground, like in manim itself. A mobject changed from another
+mobject's updater must therefore have an updater of its own or be drawn
+before the first static overlay mobject.
+
+Usage:
+    import static_layers
+    static_layers.enable()   # before the scene renders; render_all.py does this
+"""
+
+import functools
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from frame_dedup import frame_fingerprint
+
+# Cached Cairo layers per renderer; a 1080p layer is about 8 MB
+max_layers = 4
+
+_originals = []
+
+
+def active_members(scene, animations):
+    """Ids of every family member that can change during a play of ``animations``."""
+    animated = {id(animation.mobject) for animation in animations}
+    foreground = {id(mobject) for mobject in scene.foreground_mobjects}
+    active = set()
+    for mobject in scene.get_mobject_family_members():
+        if id(mobject) in animated or id(mobject) in foreground or mobject.get_family_updaters():
+            active.update(id(member) for member in mobject.get_family())
+    return active
+
+
+def _split_overlay(get_moving_and_static):
+    def wrapper(self, animations):
+        from manim.utils.family import extract_mobject_family_members
+        from manim.utils.iterables import list_update
+
+        moving, static = get_moving_and_static(self, animations)
+        drawn = extract_mobject_family_members(
+            list_update(self.mobjects, self.foreground_mobjects),
+            use_z_index=self.renderer.camera.use_z_index,
+            only_those_with_points=True,
+        )
+        active = active_members(self, animations)
+        last = max((k for k, member in enumerate(drawn) if id(member) in active), default=-1)
+        overlay = {id(member) for member in drawn[last + 1:]}
+        remaining = [member for member in moving if id(member) not in overlay]
+
+        # With nothing left to redraw, manim freezes the frame or draws everything itself
+        self._overlay_mobjects = drawn[last + 1:] if remaining else []
+        return (remaining, static) if remaining else (moving, static)
+    return wrapper
+
+
+def _cached(renderer, key, build):
+    layers = renderer.__dict__.setdefault("_layers", OrderedDict())
+    if key in layers:
+        layers.move_to_end(key)
+        return layers[key]
+    layer = layers[key] = build()
+    while len(layers) > max_layers:
+        layers.popitem(last=False)
+    return layer
+
+
+def _rasterize_overlay(renderer, mobjects):
+    """Draws ``mobjects`` on a transparent frame; returns it with the window its pixels cover."""
+    camera = renderer.camera
+    camera.set_pixel_array(np.zeros_like(camera.pixel_array))
+    camera.capture_mobjects(mobjects)
+    layer = camera.pixel_array.copy()
+    alpha = layer[:, :, 3]
+    rows, cols = np.flatnonzero(alpha.any(axis=1)), np.flatnonzero(alpha.any(axis=0))
+    if not len(rows):
+        return None
+    window = np.s_[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+    return layer[window].copy(), window
+
+
+def _composite(pixels, overlay):
+    # Cairo pixels are premultiplied, so "over" is top + bottom * (1 - top alpha)
+    layer, window = overlay
+    bottom = pixels[window].astype(np.uint16)
+    transparency = 255 - layer[:, :, 3:].astype(np.uint16)
+    pixels[window] = np.minimum(layer + (bottom * transparency + 127) // 255, 255)
+
+
+def _cairo_save_static(save_static_frame_data):
+    def wrapper(self, scene, static_mobjects):
+        self._overlay = None
+        if self.skip_animations:
+            return save_static_frame_data(self, scene, static_mobjects)
+
+        overlay = getattr(scene, "_overlay_mobjects", None)
+        if overlay:
+            key = ("overlay", frame_fingerprint(overlay, self.camera))
+            self._overlay = _cached(self, key, lambda: _rasterize_overlay(self, overlay))
+
+        if not static_mobjects:
+            return save_static_frame_data(self, scene, static_mobjects)
+        key = ("background", frame_fingerprint(static_mobjects, self.camera))
+        self.static_image = _cached(self, key, lambda: save_static_frame_data(self, scene, static_mobjects))
+        return self.static_image
+    return wrapper
+
+
+def _cairo_update_frame(update_frame):
+    def wrapper(self, scene, mobjects=None, *args, **kwargs):
+        update_frame(self, scene, mobjects, *args, **kwargs)
+        # Only frames of the moving mobjects get the overlay, not the layers themselves
+        overlay = getattr(self, "_overlay", None)
+        if overlay is not None and mobjects is scene.moving_mobjects:
+            _composite(self.camera.pixel_array, overlay)
+    return wrapper
+
+
+def _opengl_play(play):
+    def wrapper(self, scene, *args, **kwargs):
+        self._play_layer = None
+        try:
+            return play(self, scene, *args, **kwargs)
+        finally:
+            del self._play_layer
+    return wrapper
+
+
+def _static_count(scene):
+    """How many of the scene's mobjects, from the bottom, stay still during the current play."""
+    active = active_members(scene, scene.animations)
+    for count, mobject in enumerate(scene.mobjects):
+        if any(id(member) in active for member in mobject.get_family()):
+            return count
+    return len(scene.mobjects)
+
+
+def _opengl_layer(renderer, scene, static):
+    key = frame_fingerprint(static, scene.camera)
+    held = getattr(renderer, "_static_layer", None)
+    if held is not None and held[0] == key:
+        return held[1]
+    layer = held[1] if held is not None else renderer.get_frame_buffer_object(renderer.context, 0)
+    layer.use()
+    layer.clear(*renderer.background_color)
+    for mobject in static:
+        if mobject.should_render:
+            renderer.render_mobject(mobject)
+    renderer.frame_buffer_object.use()
+    renderer._static_layer = (key, layer)
+    return layer
+
+
+def _play_layer(renderer, scene):
+    """The number of static mobjects and their layer for this play, or (0, None) to draw normally."""
+    count = _static_count(scene)
+    static = scene.mobjects[:count]
+    # The copied layer has no depth, so depth-tested mobjects are drawn normally
+    if not static or any(member.depth_test for mobject in static for member in mobject.get_family()):
+        return 0, None
+    return count, _opengl_layer(renderer, scene, static)
+
+
+def _opengl_update_frame(update_frame):
+    # Same steps as OpenGLRenderer.update_frame, starting from the static layer
+    def wrapper(self, scene):
+        if not hasattr(self, "_play_layer") or self.window is not None or not scene.animations:
+            return update_frame(self, scene)
+        if self._play_layer is None:
+            # Static content cannot change during the play, so the layer is looked up once
+            self.refresh_perspective_uniforms(scene.camera)
+            self._play_layer = _play_layer(self, scene)
+        count, layer = self._play_layer
+        if layer is None:
+            return update_frame(self, scene)
+
+        self.frame_buffer_object.clear(*self.background_color)
+        self.refresh_perspective_uniforms(scene.camera)
+        self.context.copy_framebuffer(self.frame_buffer_object, layer)
+        for mobject in scene.mobjects[count:]:
+            if mobject.should_render:
+                self.render_mobject(mobject)
+        for obj in scene.meshes:
+            for mesh in obj.get_meshes():
+                mesh.set_uniforms(self)
+                mesh.render()
+        self.animation_elapsed_time = time.time() - self.animation_start_time
+    return wrapper
+
+
+def _patch(owner, name, make_wrapper):
+    original = getattr(owner, name)
+    _originals.append((owner, name, original))
+    setattr(owner, name, functools.wraps(original)(make_wrapper(original)))
+
+
+def enable():
+    """Turns static layers on for both renderers."""
+    if _originals:
+        return
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.renderer.opengl_renderer import OpenGLRenderer
+    from manim.scene.scene import Scene
+
+    _patch(Scene, "get_moving_and_static_mobjects", _split_overlay)
+    _patch(CairoRenderer, "save_static_frame_data", _cairo_save_static)
+    _patch(CairoRenderer, "update_frame", _cairo_update_frame)
+    _patch(OpenGLRenderer, "play", _opengl_play)
+    _patch(OpenGLRenderer, "update_frame", _opengl_update_frame)
+
+
+def disable():
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
@@ -0,0 +1,170 @@
+# stream_writer.py
+
+"""
+Encodes a whole scene into one video stream instead of one partial movie
+file per play call.
+
+Normally manim opens a new container and writer thread for every play,
+closes it at the end of the play and finally concatenates all partial
+files into the scene video. Scenes made of hundreds of short plays, like
+the sorting scenes, spend much of their time on that. With streaming
+enabled, the file writer opens a single encoder at the first written play
+and keeps it, and its writer thread, running until the scene finishes.
+Frames reach the thread through a bounded queue, so rasterizing the next
+frame overlaps with encoding the previous ones while memory stays capped.
+The finished stream is moved into place as the scene video, without a
+concatenation pass.
+
+Streaming makes manim's per-play cache meaningless, so it is off for the
+scene (disable_caching): every play is rendered and none is hashed. Scenes with sound get their audio muxed in
+by manim as usual, from the single stream. Section videos (--save_sections)
+and GIF output still need partial files, so those renders fall back to
+the normal writer.
+
+Usage:
+    import stream_writer
+    stream_writer.enable()   # before the scene renders; render_all.py does this
+"""
+
+import functools
+import shutil
+from queue import Queue
+from threading import Thread
+
+# Frames waiting for the encoder; a 1080p frame is about 8 MB
+queue_size = 32
+
+_originals = []
+
+
+def _streams():
+    from manim import config
+    from manim.utils.file_ops import is_gif_format, write_to_movie
+
+    return write_to_movie() and not is_gif_format() and not config.save_sections
+
+
+def _open_stream(writer):
+    # Same codec choices as SceneFileWriter.open_partial_movie_stream
+    import av
+    from manim import config
+    from manim.scene.scene_file_writer import to_av_frame_rate
+
+    codec, pix_fmt = "libx264", "yuv420p"
+    options = {"an": "1", "crf": "23"}
+    if config.movie_file_extension == ".webm":
+        codec = "libvpx-vp9"
+        options["-auto-alt-ref"] = "1"
+        if config.transparent:
+            pix_fmt = "yuva420p"
+    elif config.transparent:
+        codec, pix_fmt = "qtrle", "argb"
+
+    path = writer.partial_movie_directory / f"stream{config.movie_file_extension}"
+    container = av.open(str(path), mode="w")
+    stream = container.add_stream(codec, rate=to_av_frame_rate(config.frame_rate), options=options)
+    stream.pix_fmt = pix_fmt
+    stream.width = config.pixel_width
+    stream.height = config.pixel_height
+
+    writer.partial_movie_file_path = path
+    writer.video_container = container
+    writer.video_stream = stream
+    writer.queue = Queue(maxsize=queue_size)
+    writer.writer_thread = Thread(target=writer.listen_and_write, name="stream-writer", daemon=True)
+    writer.writer_thread.start()
+    writer._streaming = True
+
+
+def _close_stream(writer):
+    writer.queue.put((-1, None))
+    writer.writer_thread.join()
+    for packet in writer.video_stream.encode():
+        writer.video_container.mux(packet)
+    writer.video_container.close()
+    writer._streaming = False
+    return writer.partial_movie_file_path
+
+
+def _init(init):
+    def wrapper(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        if _streams():
+            from manim import config
+
+            # No play is looked up in the cache, so skip hashing every mobject on every play.
+            # The writer is created inside the scene's tempconfig, which undoes this afterwards.
+            config.disable_caching = True
+    return wrapper
+
+
+def _begin_animation(begin_animation):
+    def wrapper(self, allow_write=False, file_path=None):
+        if not _streams():
+            return begin_animation(self, allow_write, file_path)
+        if allow_write and not getattr(self, "_streaming", False):
+            _open_stream(self)
+    return wrapper
+
+
+def _end_animation(end_animation):
+    def wrapper(self, allow_write=False):
+        # The stream stays open for the next play
+        if not _streams():
+            return end_animation(self, allow_write)
+    return wrapper
+
+
+def _add_partial_movie_file(add_partial_movie_file):
+    def wrapper(self, hash_animation):
+        # None keeps the list aligned with num_plays without naming a file that is never written
+        return add_partial_movie_file(self, None if _streams() else hash_animation)
+    return wrapper
+
+
+def _is_already_cached(is_already_cached):
+    def wrapper(self, hash_invocation):
+        return False if _streams() else is_already_cached(self, hash_invocation)
+    return wrapper
+
+
+def _finish(finish):
+    def wrapper(self):
+        if not getattr(self, "_streaming", False):
+            return finish(self)
+        path = _close_stream(self)
+        if self.includes_sound:
+            # Let manim mux the audio into the single stream
+            self.partial_movie_files = [str(path)]
+            return finish(self)
+        shutil.move(str(path), str(self.movie_file_path))
+        self.print_file_ready_message(str(self.movie_file_path))
+        if self.subcaptions:
+            self.write_subcaption_file()
+    return wrapper
+
+
+def _patch(owner, name, make_wrapper):
+    original = getattr(owner, name)
+    _originals.append((owner, name, original))
+    setattr(owner, name, functools.wraps(original)(make_wrapper(original)))
+
+
+def enable():
+    """Makes every scene write a single video stream."""
+    if _originals:
+        return
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    _patch(SceneFileWriter, "__init__", _init)
+    _patch(SceneFileWriter, "begin_animation", _begin_animation)
+    _patch(SceneFileWriter, "end_animation", _end_animation)
+    _patch(SceneFileWriter, "add_partial_movie_file", _add_partial_movie_file)
+    _patch(SceneFileWriter, "is_already_cached", _is_already_cached)
+    _patch(SceneFileWriter, "finish", _finish)
+
+
+def disable():
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
@@ -0,0 +1,100 @@
+# test_embedding_space.py
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from embedding_space import AnalogyIndex, cull_labels, fit_to_extent, load_embeddings, pca_2d
+
+
+# Dimensions: royalty, gender, person, fruit
+WORDS = ["king", "queen", "man", "woman", "prince", "apple", "banana", "princess", "throne"]
+VECTORS = np.array([
+    [0.9, 0.8, 0.7, 0.0],
+    [0.9, -0.8, 0.7, 0.0],
+    [0.0, 0.8, 0.9, 0.0],
+    [0.0, -0.8, 0.9, 0.0],
+    [0.7, 0.8, 0.5, 0.1],
+    [0.0, 0.0, 0.0, 1.0],
+    [0.1, 0.0, 0.0, 0.9],
+    [0.7, -0.6, 0.5, 0.1],
+    [1.0, 0.0, 0.1, 0.0],
+], dtype=np.float32)
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    # Anisotropic, so the two principal axes are well separated
+    return (rng.normal(size=(500, 12)) * np.linspace(5, 0.5, 12) + 3).astype(np.float32)
+
+
+@pytest.mark.parametrize("chunk", [7, 64, 8192])
+def test_pca_matches_svd(matrix, chunk, tmp_path):
+    np.save(tmp_path / "vectors.npy", matrix)
+    (tmp_path / "words.txt").write_text("\n".join(f"w{k}" for k in range(len(matrix))), encoding="utf-8")
+    vectors, words = load_embeddings(tmp_path / "vectors.npy", tmp_path / "words.txt")
+    assert isinstance(vectors, np.memmap) and len(words) == len(matrix)
+
+    projected = pca_2d(vectors, chunk=chunk)
+    centered = matrix.astype(np.float64) - matrix.mean(axis=0)
+    expected = centered @ np.linalg.svd(centered, full_matrices=False)[2][:2].T
+    # Principal axes are only defined up to sign
+    signs = np.sign(np.sum(projected * expected, axis=0))
+    assert np.allclose(projected * signs, expected, atol=1e-3)
+
+
+def test_fit_to_extent(matrix):
+    coords = fit_to_extent(pca_2d(matrix), 6, 3, percentile=90)
+    inside = (np.abs(coords[:, 0]) <= 6 + 1e-6) & (np.abs(coords[:, 1]) <= 3 + 1e-6)
+    assert inside.mean() >= 0.8
+    assert np.isclose(np.percentile(np.abs(coords), 90, axis=0), [6, 3]).any()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cull_labels_never_overlap(seed):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-8, 8, size=(2000, 3))
+    words = ["".join("abcdefgh"[: rng.integers(1, 12)]) for _ in range(len(points))]
+    bounds = (-7, -4, 7, 4)
+    char_width, height, buff = 0.14, 0.3, 0.1
+    kept = cull_labels(points, words, bounds, max_labels=200, char_width=char_width, height=height, buff=buff)
+
+    assert 0 < len(kept) <= 200
+    assert list(kept) == sorted(kept)
+    boxes = np.array([
+        (points[k, 0] + buff, points[k, 1] + buff, points[k, 0] + buff + char_width * len(words[k]), points[k, 1] + buff + height)
+        for k in kept
+    ])
+    assert np.all(boxes[:, 0] >= bounds[0]) and np.all(boxes[:, 2] <= bounds[2])
+    assert np.all(boxes[:, 1] >= bounds[1]) and np.all(boxes[:, 3] <= bounds[3])
+    overlap = (
+        (boxes[:, None, 0] < boxes[None, :, 2]) & (boxes[None, :, 0] < boxes[:, None, 2])
+        & (boxes[:, None, 1] < boxes[None, :, 3]) & (boxes[None, :, 1] < boxes[:, None, 3])
+    )
+    np.fill_diagonal(overlap, False)
+    assert not overlap.any()
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_analogy_ranks_queen_first(cached, tmp_path):
+    np.save(tmp_path / "vectors.npy", VECTORS)
+    vectors = np.load(tmp_path / "vectors.npy", mmap_mode="r")
+    cache_dir = tmp_path / "cache" if cached else None
+    for _ in range(2):  # the second index reads the cached matrix when there is one
+        index = AnalogyIndex(vectors, WORDS, cache_dir=cache_dir, chunk=4)
+        ranked = index.analogy("King", "man", "woman", k=3)
+        assert ranked[0][0] == "queen"
+        assert not {"king", "man", "woman"} & {word for word, _ in ranked}
+        assert [similarity for _, similarity in ranked] == sorted((similarity for _, similarity in ranked), reverse=True)
+        batched = index.analogies([("king", "man", "woman"), ("queen", "woman", "man")], k=3)
+        for result, single in zip(batched, [ranked, index.analogy("queen", "woman", "man", k=3)]):
+            assert [word for word, _ in result] == [word for word, _ in single]
+            assert np.allclose([s for _, s in result], [s for _, s in single], atol=1e-5)
+    assert index.neighbours("banana", k=1)[0][0] == "apple"
+    with pytest.raises(KeyError):
+        index.lookup("castle")
@@ -0,0 +1,30 @@
+# test_packet_schedule.py
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from packet_schedule import max_in_flight, pipeline_schedule
+
+
+@pytest.mark.parametrize("window", [None, 1, 4, 8])
+@pytest.mark.parametrize("num_packets, num_stages", [(24, 14), (5, 3), (1, 1)])
+def test_pool_covers_replay(num_packets, num_stages, window):
+    """Replays the schedule the way OSIPipeline.show_pipeline draws from its packet pool."""
+    schedule = pipeline_schedule(num_packets, num_stages, window)
+    free = list(range(max_in_flight(schedule, num_stages)))
+    slots = {}
+    for tick, stages in enumerate(schedule):
+        previous = schedule[tick - 1] if tick else np.full_like(stages, -1)
+        moving = np.flatnonzero(stages != previous)
+        for p in moving:
+            if stages[p] == 0:
+                slots[p] = free.pop()
+        for p in moving:
+            if stages[p] == num_stages:
+                free.append(slots.pop(p))
+    assert not slots
@@ -0,0 +1,95 @@
+# test_play_cache.py
+
+import functools
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from play_cache import _Hasher
+
+
+def key(value):
+    hasher = _Hasher()
+    hasher.feed(value)
+    return hasher.digest.hexdigest()
+
+
+class Node:
+    def __init__(self, child=None, value=0):
+        self.child = child
+        self.value = value
+
+
+def chain(depth, value):
+    node = Node(value=value)
+    for _ in range(depth):
+        node = Node(node)
+    return node
+
+
+def updater(color, scale):
+    return lambda mob: mob.set_color(color).scale(scale)
+
+
+SNIPPET = """
+import sys
+sys.path.insert(0, {root!r})
+from play_cache import _Hasher
+
+class Dot:
+    def __init__(self):
+        self.points = [[0.0, 1.0, 0.0]]
+        self.tags = {{"a", "b", "c"}}
+        self.me = self
+
+scale = 2.5
+hasher = _Hasher()
+hasher.feed([lambda mob: [mob.scale(scale) for _ in range(3)], Dot(), {{"z": 1, "a": (2, 3)}}, frozenset("xyz")])
+print(hasher.digest.hexdigest())
+"""
+
+
+def test_key_stable_across_processes():
+    """Hash seeds and addresses differ between the runs, the key must not."""
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", SNIPPET.format(root=str(ROOT))],
+            capture_output=True, text=True, check=True, env={"PYTHONHASHSEED": str(seed)},
+        ).stdout.strip()
+        for seed in (1, 2, 3)
+    }
+    assert len(keys) == 1
+
+
+def test_key_follows_closure_values():
+    assert key(updater("RED", 1.2)) == key(updater("RED", 1.2))
+    assert key(updater("RED", 1.2)) != key(updater("BLUE", 1.2))
+    assert key(updater("RED", 1.2)) != key(updater("RED", 1.3))
+
+
+def test_key_follows_partial_args():
+    assert key(functools.partial(max, 1, key=abs)) == key(functools.partial(max, 1, key=abs))
+    assert key(functools.partial(max, 1)) != key(functools.partial(max, 2))
+    assert key(functools.partial(max, 1, key=abs)) != key(functools.partial(max, 1, key=len))
+
+
+def test_key_follows_deeply_nested_values():
+    for depth in (0, 6, 7, 40):
+        assert key(chain(depth, np.zeros(3))) == key(chain(depth, np.zeros(3)))
+        assert key(chain(depth, np.zeros(3))) != key(chain(depth, np.ones(3)))
+    nested = [[[[[[[[{"value": 1}]]]]]]]]
+    assert key(nested) != key([[[[[[[[{"value": 2}]]]]]]]])
+
+
+def test_key_handles_cycles():
+    a, b = Node(), Node()
+    a.child, b.child = b, a
+    items = [1]
+    items.append(items)
+    assert key(a) == key(a)
+    assert key(items) != key([1, [1]])
@@ -0,0 +1,112 @@
+# test_sort_engine.py
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sort_engine import (
+    COMPARE,
+    LINE,
+    SORTED,
+    SWAP,
+    SortEvent,
+    batch_steps,
+    bubble_sort_events,
+    group_steps,
+    merge_sort_layout,
+    merge_sort_trace,
+)
+
+NUMBERS = [8, 5, 2, 6, 4, 9, 1, 3, 7, 0, 10, 123, 100, 45, 67]
+INPUTS = [NUMBERS, sorted(NUMBERS), sorted(NUMBERS, reverse=True), [3, 3, 1, 3], [1], []]
+
+
+def replay(values, events):
+    """Applies the swaps the way BubbleSortWithCodeScene.play_step moves its cells."""
+    arr = list(values)
+    for event in events:
+        if event.kind == SWAP:
+            arr[event.i], arr[event.j] = arr[event.j], arr[event.i]
+    return arr
+
+
+@pytest.mark.parametrize("values", INPUTS)
+def test_bubble_replay_sorts(values):
+    events = bubble_sort_events(values)
+    assert replay(values, events) == sorted(values)
+    assert sorted(event.i for event in events if event.kind == SORTED) == list(range(len(values)))
+    assert events[0] == SortEvent(LINE, 1)
+    if values:
+        # play_step pauses after every sorted slot but this last one, like the hand-written loop did
+        assert [event for event in events if event == SortEvent(SORTED, 0)] == [events[-1]]
+
+
+@pytest.mark.parametrize("values", INPUTS)
+def test_steps_keep_every_event(values):
+    events = bubble_sort_events(values)
+    steps = group_steps(events)
+    assert [event for step in steps for event in step] == events
+    for step in steps:
+        assert len(step) == 1 or [event.kind for event in step] == [LINE, COMPARE]
+
+
+@pytest.mark.parametrize("max_plays", [0, 1, 7, 60, 10_000])
+def test_batches_respect_max_plays(max_plays):
+    steps = group_steps(bubble_sort_events(NUMBERS))
+    size, batches = batch_steps(steps, max_plays)
+    assert len(batches) <= max(1, max_plays)
+    assert all(len(batch) <= size for batch in batches)
+    assert [step for batch in batches for step in batch] == steps
+    assert replay(NUMBERS, [event for batch in batches for step in batch for event in step]) == sorted(NUMBERS)
+
+
+def reference_merge_sort(values, lo, hi, depth, comparisons):
+    """Plain top-down merge sort of the indices in [lo, hi), counting comparisons per depth."""
+    if hi - lo < 2:
+        return list(range(lo, hi))
+    mid = (lo + hi) // 2
+    left = reference_merge_sort(values, lo, mid, depth + 1, comparisons)
+    right = reference_merge_sort(values, mid, hi, depth + 1, comparisons)
+    merged = []
+    while left and right:
+        comparisons[depth] = comparisons.get(depth, 0) + 1
+        merged.append(right.pop(0) if values[right[0]] < values[left[0]] else left.pop(0))
+    return merged + left + right
+
+
+@pytest.mark.parametrize("values", INPUTS[:-1] + [[2, 1], [5, 1, 4, 1, 5, 9, 2, 6]])
+def test_merge_trace_levels(values):
+    trace = merge_sort_trace(values)
+    n = len(values)
+    depth = len(trace.levels) - 1
+    assert trace.orders.shape == (depth + 1, n)
+    assert list(trace.orders[depth]) == list(range(n))
+    for d, level in enumerate(trace.levels):
+        assert [slot for lo, hi in level for slot in range(lo, hi)] == list(range(n))
+        for lo, hi in level:
+            ranked = [values[index] for index in trace.orders[d, lo:hi]]
+            assert ranked == sorted(ranked)
+            # A level only rearranges elements within its own ranges
+            assert sorted(trace.orders[d, lo:hi]) == list(range(lo, hi))
+    assert [values[index] for index in trace.orders[0]] == sorted(values)
+
+    comparisons = {}
+    assert list(trace.orders[0]) == reference_merge_sort(values, 0, n, 0, comparisons)
+    assert trace.comparisons == [comparisons.get(d, 0) for d in range(depth + 1)]
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 8, 15])
+def test_merge_layout_shape(n):
+    levels = merge_sort_trace(range(n)).levels
+    positions, side = merge_sort_layout(levels)
+    depth = len(levels) - 1
+    assert positions.shape == (depth + 1, n, 3)
+    assert np.allclose(positions[:, :, 2], 0)
+    for row in positions:
+        assert np.all(np.diff(row[:, 0]) >= side)
+        assert np.isclose(row[:, 0].min(), -row[:, 0].max())
+    assert np.all(np.diff(positions[:, 0, 1]) <= -side)
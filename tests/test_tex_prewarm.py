@@ -0,0 +1,49 @@
+# test_tex_prewarm.py
+
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+pytest.importorskip("manim")
+if not (shutil.which("latex") and shutil.which("dvisvgm")):
+    pytest.skip("needs LaTeX and dvisvgm", allow_module_level=True)
+
+from manim import Integer, Scene, tempconfig
+from manim.mobject.text import numbers
+
+import components
+import tex_prewarm
+from components import sort_cell
+
+
+class IntegerScene(Scene):
+    def construct(self):
+        self.add(Integer(1234), sort_cell(56))
+
+
+def _built():
+    return [mobject.get_all_points() for mobject in (Integer(1234), sort_cell(56))]
+
+
+def _clear_caches():
+    numbers.string_to_mob_map.clear()
+    components._prototypes.clear()
+
+
+def test_prewarm_leaves_integers_unchanged(tmp_path):
+    """A scene with Integers builds the same geometry with and without the prewarm pass."""
+    with tempconfig({"media_dir": str(tmp_path)}):
+        _clear_caches()
+        assert tex_prewarm.prewarm_scene(IntegerScene) > 0
+        prewarmed = _built()
+
+        _clear_caches()
+        fresh = _built()
+
+    for after_prewarm, without in zip(prewarmed, fresh):
+        np.testing.assert_allclose(after_prewarm, without)
@@ -0,0 +1,65 @@
+# test_timeline.py
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+pytest.importorskip("manim")
+
+from manim import LEFT, PI, RIGHT, AnimationGroup, Circle, FadeIn, Rotate, Scene, Square, Succession, linear, tempconfig
+from manim.animation.animation import prepare_animation
+
+from timeline import Timeline
+
+# Forwards over every clip boundary, then backwards
+TIMES = [0.0, 0.3, 1.0, 1.4, 1.75, 2.5, 2.9, 3.5, 1.2, 0.1, 2.2]
+
+
+def build():
+    square = Square()
+    circle = Circle().shift(LEFT * 2)
+    return Succession(
+        square.animate.shift(RIGHT * 2),
+        AnimationGroup(FadeIn(circle), Rotate(square, PI / 2), lag_ratio=0.5),
+        circle.animate(rate_func=linear).scale(0.5),
+    )
+
+
+def snapshot(scene):
+    return [
+        (type(member).__name__, member.points.copy(), member.get_fill_opacity(), member.get_stroke_opacity())
+        for mobject in scene.mobjects
+        for member in mobject.get_family()
+    ]
+
+
+def played(t, frames=60):
+    """A fresh scene after playing the Succession frame by frame up to ``t``, the way Scene.play does."""
+    scene = Scene()
+    animation = prepare_animation(build())
+    scene.add_mobjects_from_animations([animation])
+    animation._setup_scene(scene)
+    animation.begin()
+    duration = animation.get_run_time()
+    for time in np.linspace(0, t, frames):
+        animation.interpolate(time / duration)
+    if t >= duration:
+        animation.finish()
+        animation.clean_up_from_scene(scene)
+    return scene
+
+
+def test_seek_matches_playing(tmp_path):
+    with tempconfig({"media_dir": str(tmp_path)}):
+        timeline = Timeline(build()).bind(Scene())
+        assert timeline.duration == pytest.approx(3.5)
+        for t in TIMES:
+            seeked, expected = snapshot(timeline.seek(t)), snapshot(played(t))
+            assert [entry[0] for entry in seeked] == [entry[0] for entry in expected], t
+            for (_, points, fill, stroke), (_, points_, fill_, stroke_) in zip(seeked, expected):
+                np.testing.assert_allclose(points, points_, atol=1e-6, err_msg=f"t={t}")
+                assert fill == pytest.approx(fill_, abs=1e-6) and stroke == pytest.approx(stroke_, abs=1e-6)
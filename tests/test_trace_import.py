@@ -0,0 +1,95 @@
+# test_trace_import.py
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sort_engine import LINE, SORTED, SWAP, SortEvent, bubble_sort_events
+from trace_import import keyframes, open_trace
+
+NUMBERS = [8, 5, 2, 6, 4, 9, 1, 3, 7, 0, 10, 123, 100, 45, 67]
+
+
+def notebook_log(values):
+    """What the bubble sort cells of test.ipynb print for ``values``."""
+    arr = list(values)
+    lines = [f"Element at index {index} is {value}" for index, value in enumerate(arr)]
+    length = len(arr)
+    for i in range(length - 1):
+        for j in range(length - i - 1):
+            lines.append(f"Comparing elements at index {j} and {j + 1}")
+            if arr[j] > arr[j + 1]:
+                lines.append(f"Swapping elements {arr[j]} and {arr[j + 1]}")
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                lines.append(f"Array after swap: {arr}")
+        lines.append(f"Array after pass {i + 1} : {arr}")
+    lines.append(f"Sorted array: {arr}")
+    return "\n".join(lines) + "\n"
+
+
+def replay(values, batches):
+    arr = list(values)
+    slots = set()
+    for batch in batches:
+        for step in batch:
+            for event in step:
+                if event.kind == SWAP:
+                    arr[event.i], arr[event.j] = arr[event.j], arr[event.i]
+                elif event.kind == SORTED:
+                    slots.add(event.i)
+    return arr, slots
+
+
+@pytest.mark.parametrize("values", [NUMBERS, sorted(NUMBERS), [2.5, -1, 7], [4]])
+def test_log_matches_bubble_sort_events(values, tmp_path):
+    path = tmp_path / "sort.log"
+    path.write_text(notebook_log(values), encoding="utf-8")
+    parsed, events = open_trace(path)
+    assert parsed == values
+    assert list(events) == bubble_sort_events(values)
+
+
+def test_jsonl_round_trip(tmp_path):
+    events = bubble_sort_events(NUMBERS)
+    path = tmp_path / "sort.jsonl"
+    records = [{"values": NUMBERS}] + [{"kind": kind, "i": i, "j": j} for kind, i, j in events]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8")
+    values, parsed = open_trace(path)
+    assert values == NUMBERS
+    assert list(parsed) == events
+
+
+def test_missing_values_raise(tmp_path):
+    path = tmp_path / "sort.jsonl"
+    path.write_text('{"kind": "line", "i": 1}\n{"kind": "swap", "i": 0, "j": 1}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="no values"):
+        open_trace(path)
+
+    path.write_text("Comparing elements at index 0 and 1\nSwapping elements 8 and 5\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="no values"):
+        open_trace(path)
+
+    # Code lines alone refer to no element
+    path.write_text('{"kind": "line", "i": 1}\n', encoding="utf-8")
+    values, events = open_trace(path)
+    assert values == [] and list(events) == [SortEvent(LINE, 1)]
+
+
+@pytest.mark.parametrize("max_plays", [1, 2, 5, 17, 60, 10_000])
+@pytest.mark.parametrize("seed", range(3))
+def test_keyframes_replay_sorts(max_plays, seed):
+    values = list(range(25))
+    random.Random(seed).shuffle(values)
+    events = bubble_sort_events(values)
+    size, batches = keyframes(iter(events), max_plays)
+    assert len(batches) <= max_plays
+    arr, slots = replay(values, batches)
+    assert arr == sorted(values)
+    assert slots == set(range(len(values)))
+    if size == 1:
+        assert [event for batch in batches for step in batch for event in step] == events
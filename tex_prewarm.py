@@ -0,0 +1,144 @@
+# tex_prewarm.py
+
+"""
+Compiles every TeX string a scene needs before the scene is rendered.
+
+Manim compiles MathTex, Tex, Matrix and Integer strings one at a time as
+construct() reaches them, each with its own LaTeX + dvisvgm round trip.
+Here construct() is first run, in a throwaway forked process, with
+animations skipped and TeX compilation replaced by a recorder that returns
+a placeholder SVG. The recorded
+strings are then compiled concurrently into manim's own Tex folder, which
+is content addressed (files are named after a hash of the full .tex
+source), so the real render finds every SVG already there.
+
+Usage:
+    python tex_prewarm.py ai_basics/manim/the_calculator.py SingleNeuronProcess NeuronLayerScene
+"""
+
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from pathlib import Path
+
+from manim import config, logger, tempconfig
+from manim.mobject.text import tex_mobject
+from manim.utils.tex_file_writing import delete_nonsvg_files, generate_tex_file, tex_to_svg_file
+
+PLACEHOLDER_SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1"><path d="M0 0H1V1H0Z"/></svg>'
+
+
+def _placeholder_file():
+    path = Path(tempfile.gettempdir()) / "manim_tex_prewarm_placeholder.svg"
+    if not path.is_file():
+        path.write_text(PLACEHOLDER_SVG, encoding="utf-8")
+    return path
+
+
+def _record_tex(scene_class):
+    requested = {}
+    placeholder = _placeholder_file()
+
+    def record(expression, environment=None, tex_template=None):
+        key = (expression, environment, id(tex_template))
+        requested.setdefault(key, (expression, environment, tex_template))
+        return placeholder
+
+    tex_mobject.tex_to_svg_file = record
+    try:
+        with tempconfig({"dry_run": True}):
+            scene = scene_class(skip_animations=True)
+            scene.setup()
+            scene.construct()
+    except Exception as error:
+        logger.info(f"TeX prewarm of {scene_class.__name__} stopped early: {error!r}")
+    return list(requested.values())
+
+
+# The scene class being recorded, inherited by the forked recorder
+_recording = None
+
+
+def _record_inherited():
+    return _record_tex(_recording)
+
+
+def collect_tex(scene_class):
+    """
+    Returns the (expression, environment, tex_template) triples that
+    ``scene_class`` compiles, in the order it asks for them.
+
+    Scene code runs against placeholder geometry here, so it may fail part
+    way through. Whatever was recorded up to that point is still returned;
+    the remaining strings are simply compiled by the real render as usual.
+
+    The recording runs in a throwaway forked process. Everything built from
+    the placeholders there (manim's Integer digit cache, the prototypes of
+    components.py, shared setups of scenes) dies with it, so the real render
+    never copies placeholder geometry. Without fork nothing is recorded.
+    """
+    global _recording
+    if "fork" not in get_all_start_methods():
+        logger.info(f"TeX prewarm of {scene_class.__name__} skipped: it needs the fork start method")
+        return []
+    _recording = scene_class
+    try:
+        with get_context("fork").Pool(1) as pool:
+            return pool.apply(_record_inherited)
+    finally:
+        _recording = None
+
+
+def prewarm(requests, workers=None):
+    """
+    Compiles the requests whose SVG is not cached yet, several at a time.
+    Returns the number of strings that had to be compiled.
+    """
+    config.get_dir("tex_dir").mkdir(parents=True, exist_ok=True)
+    missing = [
+        request for request in requests
+        if not generate_tex_file(*request).with_suffix(".svg").exists()
+    ]
+    if not missing:
+        return 0
+
+    # Each compile would otherwise delete the intermediate files of the others
+    no_cleanup = config.no_latex_cleanup
+    config.no_latex_cleanup = True
+    try:
+        # LaTeX and dvisvgm run as subprocesses, so threads are enough to keep every core busy
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            list(pool.map(lambda request: tex_to_svg_file(*request), missing))
+    finally:
+        config.no_latex_cleanup = no_cleanup
+    if not no_cleanup:
+        delete_nonsvg_files()
+    return len(missing)
+
+
+def prewarm_scene(scene_class, workers=None):
+    """Collects and compiles the TeX strings of ``scene_class``."""
+    return prewarm(collect_tex(scene_class), workers)
+
+
+def main(argv=None):
+    from render_all import load_module
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print(__doc__)
+        return 2
+
+    path = Path(argv[0]).resolve()
+    with tempconfig({"input_file": str(path)}):
+        module = load_module(path)
+        for name in argv[1:]:
+            compiled = prewarm_scene(getattr(module, name))
+            print(f"{name}: compiled {compiled} TeX string(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
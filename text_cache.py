@@ -0,0 +1,40 @@
+# text_cache.py
+
+"""
+Cache for Text and MarkupText mobjects.
+
+Identical strings are shaped by Pango and turned into outlines only once
+per process. Prototypes live in an in-process LRU; nothing is stored on
+disk, since mobjects do not pickle reliably and loading pickles from a
+shared media folder would run whatever was written there. Every lookup
+returns a copy, so callers are free to move or recolour what they get.
+"""
+
+from collections import OrderedDict
+
+from manim import MarkupText, Text, config
+
+# Number of prototypes kept in memory
+max_cached = 512
+
+_prototypes = OrderedDict()
+
+
+def cached_text(text, markup=False, **kwargs):
+    """
+    Drop-in replacement for ``Text(text, **kwargs)``, or for
+    ``MarkupText(text, **kwargs)`` when ``markup`` is true.
+    """
+    # Text builds different classes per renderer
+    key = repr((text, markup, sorted(kwargs.items()), str(config.renderer)))
+
+    prototype = _prototypes.get(key)
+    if prototype is None:
+        prototype = (MarkupText if markup else Text)(text, **kwargs)
+        _prototypes[key] = prototype
+        if len(_prototypes) > max_cached:
+            _prototypes.popitem(last=False)
+    else:
+        _prototypes.move_to_end(key)
+    return prototype.copy()
+
@@ -0,0 +1,251 @@
+# timeline.py
+
+"""
+Compiles a nested Succession / AnimationGroup into a flat timeline, so
+the scene can be put into its state at any time directly instead of
+interpolating everything that comes before it.
+
+Every leaf animation becomes a Clip with the scene times at which manim
+begins it, interpolates it and finishes it, following the rules of the
+groups around it: an AnimationGroup begins all its children up front and
+finishes them together, a Succession begins and finishes each child in
+turn. Those times are the keyframes of the timeline. For each interval
+between two keyframes the timeline stores which clips are running, so
+finding them for a time is a binary search.
+
+Seeking restores the mobject state saved at the keyframe before the time
+and then interpolates only the clips running at that time. Keyframe states
+are captured the first time the timeline passes them, so a scene is played
+forward at most once, one event per clip. After that, any time is reached
+in constant work, backwards as well as forwards. Scene updaters are not
+run while seeking.
+
+Usage:
+    python timeline.py ai_basics/manim/the_calculator.py SingleNeuronProcess 17 18.5
+    python timeline.py ai_basics/manim/the_calculator.py NeuronLayerScene --every 1
+
+Scenes take part by building their animation in ``build_animation()`` and
+declaring its ``run_time``, see the_calculator.py.
+"""
+
+import argparse
+import bisect
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+# ``start``/``end`` bound the interpolation; ``begin_at``/``finish_at`` are when manim calls begin()/finish()
+Clip = namedtuple("Clip", ["animation", "start", "end", "begin_at", "finish_at", "alpha"])
+
+
+def _invert(alpha, target, lo, hi, steps=60):
+    """The earliest scene time in [lo, hi] at which the nondecreasing ``alpha`` reaches ``target``."""
+    for _ in range(steps):
+        middle = (lo + hi) / 2
+        if alpha(middle) < target:
+            lo = middle
+        else:
+            hi = middle
+    # Rounded so that the end of one clip and the start of the next land on the same keyframe
+    return round(hi, 9)
+
+
+def _is_group(animation):
+    from manim import AnimationGroup
+
+    return isinstance(animation, AnimationGroup)
+
+
+def _compile(animation, alpha, span, begin_at, finish_at, clips):
+    """
+    Appends the clips of ``animation``, whose own alpha at scene time t is
+    ``alpha(t)`` within the scene interval ``span``.
+    """
+    from manim import Succession
+
+    if not _is_group(animation):
+        clips.append(Clip(animation, span[0], span[1], begin_at, finish_at, alpha))
+        return
+
+    sequential = isinstance(animation, Succession)
+    for child, start, end in animation.anims_with_timings:
+        def child_alpha(t, start=start, end=end):
+            group_time = animation.rate_func(alpha(t)) * animation.max_end_time
+            return (group_time - start) / (end - start) if end > start else float(group_time >= start)
+
+        child_span = (_invert(child_alpha, 0, *span), _invert(child_alpha, 1, *span))
+        if end <= start:
+            child_span = (child_span[1], child_span[1])
+        if sequential:
+            # A Succession begins each child when it starts and finishes it when the next one does
+            _compile(child, child_alpha, child_span, child_span[0], child_span[1], clips)
+        else:
+            _compile(child, child_alpha, child_span, begin_at, finish_at, clips)
+
+
+def _capture(mobjects):
+    """The array, scalar and submobject state of every family member of ``mobjects``."""
+    state = []
+    for mobject in mobjects:
+        for member in mobject.get_family():
+            saved = {}
+            for name, value in vars(member).items():
+                if isinstance(value, np.ndarray):
+                    saved[name] = value.copy()
+                elif isinstance(value, (bool, int, float, str, np.generic)):
+                    saved[name] = value
+                elif name == "submobjects":
+                    saved[name] = list(value)
+                elif isinstance(value, dict) and name in ("data", "uniforms"):
+                    # OpenGL mobjects keep their points and colours in these
+                    saved[name] = {key: np.array(item) for key, item in value.items()}
+            state.append((member, saved))
+    return state
+
+
+def _restore(state):
+    for member, saved in state:
+        for name, value in saved.items():
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            elif isinstance(value, list):
+                value = list(value)
+            elif isinstance(value, dict):
+                value = {key: item.copy() for key, item in value.items()}
+            setattr(member, name, value)
+
+
+class Timeline:
+    """
+    The flat timeline of ``animation`` played over ``run_time`` seconds,
+    or over its own duration when ``run_time`` is None.
+    """
+
+    def __init__(self, animation, run_time=None):
+        from manim.animation.animation import prepare_animation
+
+        self.animation = prepare_animation(animation)
+        if run_time is not None:
+            self.animation.run_time = run_time
+        self.duration = self.animation.get_run_time()
+
+        self.clips = []
+        span = (0.0, self.duration)
+        root_alpha = lambda t: t / self.duration if self.duration else 1.0
+        _compile(self.animation, root_alpha, span, 0.0, self.duration, self.clips)
+
+        # Keyframes: every time at which a clip begins, starts, ends or finishes
+        self.times = sorted(
+            {0.0, self.duration}
+            | {time for clip in self.clips for time in (clip.begin_at, clip.start, clip.end, clip.finish_at)}
+        )
+        self.running = [
+            [clip for clip in self.clips if clip.start <= time < clip.end]
+            for time in self.times
+        ]
+        self.scene = None
+
+    def keyframe(self, t):
+        """Index of the last keyframe at or before ``t``."""
+        return max(bisect.bisect_right(self.times, t) - 1, 0)
+
+    def running_at(self, t):
+        """The clips being interpolated at scene time ``t``."""
+        return self.running[self.keyframe(t)]
+
+    def bind(self, scene):
+        """Adds the animated mobjects to ``scene`` like Scene.play does and saves the starting state."""
+        self.scene = scene
+        # Clips set themselves up in the scene when they begin, as they do inside a Succession
+        scene.add_mobjects_from_animations([self.animation])
+        self._tracked = list(scene.mobjects) + [clip.animation.mobject for clip in self.clips if clip.animation.mobject]
+        self._states = []  # captured keyframe states, always a prefix of the keyframes
+        self._start = (list(scene.mobjects), _capture(self._tracked))
+        return self
+
+    def _events(self, index):
+        """Applies what manim does at keyframe ``index``: finishing clips first, then beginning new ones."""
+        time = self.times[index]
+        for clip in self.clips:
+            if clip.end == time and clip.finish_at != time:
+                clip.animation.interpolate(1)
+            if clip.finish_at == time:
+                clip.animation.finish()
+        for clip in self.clips:
+            if clip.begin_at == time:
+                clip.animation._setup_scene(self.scene)
+                clip.animation.begin()
+        if time == self.duration:
+            self.animation.clean_up_from_scene(self.scene)
+
+    def _reach(self, index):
+        """Puts the scene into its state at keyframe ``index``, capturing states on the way."""
+        known = min(index, len(self._states) - 1)
+        mobjects, state = self._start if known < 0 else self._states[known]
+        self.scene.mobjects[:] = mobjects
+        _restore(state)
+        for k in range(known + 1, index + 1):
+            if k > 0:
+                # Clips still running must be at their state of this time before new clips begin from it
+                for clip in self.running[k - 1]:
+                    if clip.end > self.times[k]:
+                        clip.animation.interpolate(clip.alpha(self.times[k]))
+            self._events(k)
+            # Mobjects introduced by a clip are only tracked from the keyframe that adds them
+            self._tracked += [mobject for mobject in self.scene.mobjects if mobject not in self._tracked]
+            self._states.append((list(self.scene.mobjects), _capture(self._tracked)))
+
+    def seek(self, t):
+        """Puts the bound scene into its state at scene time ``t``."""
+        t = min(max(t, 0.0), self.duration)
+        index = self.keyframe(t)
+        self._reach(index)
+        for clip in self.running[index]:
+            clip.animation.interpolate(clip.alpha(t))
+        return self.scene
+
+    def frame(self, t):
+        """The rendered frame at scene time ``t``, as an RGBA array."""
+        renderer = self.seek(t).renderer
+        renderer.update_frame(self.scene)
+        return renderer.get_frame()
+
+
+def main(argv=None):
+    from manim import tempconfig
+    from PIL import Image
+
+    from render_all import QUALITIES, apply_renderer, load_module
+
+    parser = argparse.ArgumentParser(description="Save frames of a scene at arbitrary times without playing it.")
+    parser.add_argument("file", type=Path)
+    parser.add_argument("scene")
+    parser.add_argument("times", nargs="*", type=float, help="scene times in seconds")
+    parser.add_argument("--every", type=float, help="also save a frame every this many seconds")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-o", "--output", type=Path, default=Path("media") / "thumbnails")
+    args = parser.parse_args(argv)
+
+    settings = {"quality": QUALITIES[args.quality], "input_file": str(args.file.resolve())}
+    with tempconfig(settings):
+        scene_class = getattr(load_module(args.file.resolve()), args.scene)
+        apply_renderer(scene_class, settings)
+        scene = scene_class()
+        scene.setup()
+        timeline = Timeline(scene.build_animation(), scene.run_time).bind(scene)
+
+        times = list(args.times)
+        if args.every:
+            times += list(np.arange(0, timeline.duration + 1e-9, args.every))
+        args.output.mkdir(parents=True, exist_ok=True)
+        for t in sorted(times):
+            path = args.output / f"{args.scene}_{t:07.2f}.png"
+            Image.fromarray(timeline.frame(t)).save(path)
+            print(f"{t:7.2f}s -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+# trace_import.py
+
+"""
+Imports recorded sorting traces into the event stream the sorting scenes
+replay (see sort_engine.py), without loading the trace into memory.
+
+Two formats are read, line by line:
+
+* JSONL: an optional header ``{"values": [8, 5, 2]}`` followed by events
+  such as ``{"kind": "swap", "i": 0, "j": 1}``, kinds as in sort_engine.
+* The log printed by the bubble sort in test.ipynb ("Element at index 0
+  is 8", "Comparing elements at index 0 and 1", "Swapping elements 8 and
+  5", "Array after pass 1 : ..."). The code line events of
+  bubble_sort_events() are filled in, so the code pointer moves as usual.
+
+Traces with more steps than the scene has play calls are downsampled while
+streaming. Steps are collected into keyframes of ``size`` steps; whenever
+there are more keyframes than plays, neighbouring keyframes are merged and
+``size`` doubles. A merged keyframe only keeps its net effect (where each
+moved element ends up, which slots got sorted and the last code line), so
+memory stays bounded by the number of plays times the array length, however
+long the trace is. Every keyframe becomes one play of about a second, so the
+sort part of the video lasts roughly ``max_plays`` seconds.
+
+Usage:
+    python trace_import.py sort.log --plays 60   # summarize what a scene would play
+
+    class BubbleSortWithCodeScene(Scene):
+        trace = "sort.log"   # or {"trace": "sort.log"} as a variant_batch.py variant
+"""
+
+import argparse
+import json
+import re
+import sys
+
+from sort_engine import COMPARE, LINE, SORTED, SWAP, SortEvent
+
+_ELEMENT = re.compile(r"Element at index (\d+) is (\S+)")
+_COMPARE = re.compile(r"Comparing elements at index (\d+) and (\d+)")
+_SWAP = re.compile(r"Swapping elements ")
+_PASS = re.compile(r"Array after pass (\d+)")
+_SORTED = re.compile(r"Sorted array")
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _records(lines):
+    """
+    Yields ("values", list) once the initial values are known, then the
+    SortEvents of the trace.
+    """
+    values = []
+    header = False
+    pair = None  # indices of the last comparison, which a logged swap refers to
+    in_pass = False
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            record = json.loads(line)
+            if "values" in record:
+                yield "values", list(record["values"])
+                header = True
+            else:
+                if not header:
+                    yield "values", []
+                    header = True
+                yield SortEvent(record["kind"], record.get("i"), record.get("j"))
+            continue
+
+        match = _ELEMENT.match(line)
+        if match:
+            values.append(_number(match.group(2)))
+            continue
+        compare, swap, end_of_pass, done = (
+            pattern.match(line) for pattern in (_COMPARE, _SWAP, _PASS, _SORTED)
+        )
+        if not (compare or swap or end_of_pass or done):
+            continue  # other prints, such as the array after every swap
+        if not header:
+            yield "values", values
+            header = True
+            # Same line numbers as bubble_sort_events(), see BubbleSortWithCodeScene
+            yield SortEvent(LINE, 1)
+        if compare:
+            pair = int(compare.group(1)), int(compare.group(2))
+            if not in_pass:
+                yield SortEvent(LINE, 2)
+                in_pass = True
+            yield SortEvent(LINE, 3)
+            yield SortEvent(LINE, 4)
+            yield SortEvent(COMPARE, *pair)
+        elif swap and pair is not None:
+            # The log names the swapped values; they are the pair compared last
+            yield SortEvent(LINE, 5)
+            yield SortEvent(SWAP, *pair)
+        elif end_of_pass:
+            yield SortEvent(SORTED, len(values) - int(end_of_pass.group(1)))
+            in_pass = False
+        elif done and values:
+            yield SortEvent(SORTED, 0)
+
+
+def open_trace(path):
+    """
+    Opens a trace file. Returns the initial values and a generator of its
+    events, which reads the rest of the file as it is consumed. Raises
+    ValueError if the events refer to elements but no values are given.
+    """
+    def lines():
+        with open(path, encoding="utf-8") as fp:
+            yield from fp
+
+    records = _records(lines())
+    for record in records:
+        if not isinstance(record, SortEvent):
+            values = record[1]
+            break
+    else:
+        return [], iter(())
+    if values:
+        return values, records
+
+    # Without values the first event that refers to an element cannot be replayed
+    read = []
+    for event in records:
+        read.append(event)
+        if event.kind != LINE:
+            raise ValueError(
+                f"{path} refers to element {event.i} but gives no values; start a JSONL trace with "
+                '{"values": [...]} or keep the "Element at index" lines of the log'
+            )
+    return values, iter(read)
+
+
+def iter_steps(events):
+    """Streaming group_steps(): a compare belongs to the code line before it."""
+    step = []
+    for event in events:
+        if event.kind == COMPARE and step and step[-1].kind == LINE:
+            step.append(event)
+            continue
+        if step:
+            yield step
+        step = [event]
+    if step:
+        yield step
+
+
+class _Keyframe:
+    """The net effect of consecutive steps."""
+
+    def __init__(self):
+        self.moves = {}  # slot -> slot its element came from, for moved elements only
+        self.sorted = []
+        self.line = None
+
+    def add(self, event):
+        if event.kind == LINE:
+            self.line = event.i
+        elif event.kind == SWAP:
+            a, b = self.moves.get(event.i, event.i), self.moves.get(event.j, event.j)
+            self.moves[event.i], self.moves[event.j] = b, a
+            for slot in (event.i, event.j):
+                if self.moves[slot] == slot:
+                    del self.moves[slot]
+        elif event.kind == SORTED:
+            self.sorted.append(event.i)
+
+    def merge(self, later):
+        """This keyframe followed by ``later``."""
+        moves = {}
+        for slot in self.moves.keys() | later.moves.keys():
+            origin = later.moves.get(slot, slot)
+            origin = self.moves.get(origin, origin)
+            if origin != slot:
+                moves[slot] = origin
+        self.moves = moves
+        self.sorted += later.sorted
+        if later.line is not None:
+            self.line = later.line
+        return self
+
+    def events(self):
+        """Swaps that rearrange the moved elements, then the sorted slots and the last code line."""
+        events = []
+        current = {slot: slot for slot in self.moves}  # slot -> origin of the element now in it
+        where = dict(current)  # origin -> slot it is in now
+        for slot, origin in sorted(self.moves.items()):
+            if current[slot] != origin:
+                other = where[origin]
+                events.append(SortEvent(SWAP, slot, other))
+                current[slot], current[other] = current[other], current[slot]
+                where[current[slot]], where[current[other]] = slot, other
+        events += [SortEvent(SORTED, slot) for slot in self.sorted]
+        if self.line is not None:
+            events.append(SortEvent(LINE, self.line))
+        return events
+
+
+def _summary(step):
+    keyframe = _Keyframe()
+    for event in step:
+        keyframe.add(event)
+    return keyframe
+
+
+def keyframes(events, max_plays):
+    """
+    Downsamples an event stream to at most ``max_plays`` batches, in the
+    ``(batch_size, batches)`` form of sort_engine.batch_steps(). Short
+    traces keep every step; longer ones become merged keyframes.
+    """
+    max_plays = max(1, max_plays)
+    steps = []  # every step, as long as the trace still fits into max_plays
+    frames = []
+    size = 1
+    pending, filled = None, 0
+    for step in iter_steps(events):
+        if steps is not None:
+            steps.append(step)
+            if len(steps) <= max_plays:
+                continue
+            # The trace outgrew the plays: from here on only net effects are kept
+            frames = [_summary(kept) for kept in steps]
+            steps = None
+        else:
+            if pending is None:
+                pending = _Keyframe()
+            for event in step:
+                pending.add(event)
+            filled += 1
+            if filled < size:
+                continue
+            frames.append(pending)
+            pending, filled = None, 0
+        frames, size = _compact(frames, size, max_plays)
+
+    if steps is not None:
+        return 1, [[step] for step in steps]
+    if pending is not None:
+        frames.append(pending)
+        frames, size = _compact(frames, size, max_plays)
+    return size, [[frame.events()] for frame in frames]
+
+
+def _compact(frames, size, max_plays):
+    """Merges neighbouring keyframes, doubling their size, until there are at most ``max_plays``."""
+    while len(frames) > max_plays:
+        frames = [
+            frames[k].merge(frames[k + 1]) if k + 1 < len(frames) else frames[k]
+            for k in range(0, len(frames), 2)
+        ]
+        size *= 2
+    return frames, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize how a sorting trace would be replayed.")
+    parser.add_argument("trace", help="JSONL trace or the log printed by test.ipynb")
+    parser.add_argument("--plays", type=int, default=60, help="play calls available for the sort (default: 60)")
+    args = parser.parse_args(argv)
+
+    values, events = open_trace(args.trace)
+    total = 0
+
+    def counted():
+        nonlocal total
+        for event in events:
+            total += 1
+            yield event
+
+    size, batches = keyframes(counted(), args.plays)
+    print(f"values:   {len(values)}")
+    print(f"events:   {total}")
+    print(f"plays:    {len(batches)}")
+    print(f"steps per play: {size}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# variant_batch.py
+
+"""
+Renders many variants of one scene, each with its own class attributes,
+while paying for the shared setup only once.
+
+The batch process imports manim and the scene file, compiles the TeX of
+every variant in one concurrent pass and calls the scene's
+``shared_setup()``, which builds and keeps the mobjects that do not depend
+on the parameters (a title, a code block, axes). Every variant is then
+rendered in a worker forked from that warm process, one fork per variant,
+so the interpreter, the imports, the text and TeX caches and the shared
+mobjects are inherited copy-on-write instead of being rebuilt. Each
+variant writes <scene>_<name> next to the scene's usual output.
+
+Variants come from a JSON file mapping a name to class attributes, or,
+for the sorting scenes, from --sort-inputs: the scene's own numbers (or
+--numbers), their worst case and --permutations random shuffles.
+
+Usage:
+    python variant_batch.py ai_basics/manim/the_calculator.py SingleNeuronProcess neuron_variants.json
+    python variant_batch.py bubble_sort_final_layout.py BubbleSortWithCodeScene --sort-inputs \\
+        --numbers 8,5,2,6,4,9,1,3,7,0,10,123,100,45,67 --permutations 5
+
+neuron_variants.json:
+    {"small_bias": {"x_val": 0.8, "w_val": 0.7, "b_val": -0.1}, "negative": {"x_val": -1.5, "w_val": 0.4, "b_val": 0.2}}
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import traceback
+from multiprocessing import get_context
+from pathlib import Path
+
+from render_all import CALIBRATION, QUALITIES, REPO_ROOT, SceneJob, apply_renderer, calibrated, load_module
+
+# The scene class loaded and warmed up by the batch process, inherited by every fork
+_scene_class = None
+
+
+def sort_variants(numbers, permutations=0, seed=0):
+    """The given numbers, their worst case for the sorting scenes and ``permutations`` random shuffles."""
+    variants = {"given": {"numbers": list(numbers)}, "worst": {"numbers": sorted(numbers, reverse=True)}}
+    rng = random.Random(seed)
+    for index in range(permutations):
+        shuffled = list(numbers)
+        rng.shuffle(shuffled)
+        variants[f"random{index + 1}"] = {"numbers": shuffled}
+    return variants
+
+
+def _variant_class(scene_class, params):
+    # Same name as the scene, so the variants land in the scene's media folders
+    return type(scene_class.__name__, (scene_class,), dict(params))
+
+
+def _enable_patches(job):
+    if job.dedup_frames:
+        import frame_dedup
+
+        frame_dedup.enable()
+    if job.static_layers:
+        import static_layers
+
+        static_layers.enable()
+    if job.stream:
+        import stream_writer
+
+        stream_writer.enable()
+
+
+def warm_up(job, variants):
+    """Loads the scene and builds everything the variants share, in this process."""
+    global _scene_class
+    from manim import tempconfig
+
+    _enable_patches(job)
+    with tempconfig(dict(job.settings, input_file=str(job.path))):
+        _scene_class = getattr(load_module(job.path), job.scene)
+        if job.prewarm_tex:
+            from tex_prewarm import collect_tex, prewarm
+
+            # collect_tex records in a throwaway fork, so the placeholder geometry it builds never
+            # reaches the caches the variants inherit; Cairo is enough to record
+            with tempconfig({"renderer": "cairo"}):
+                requests = {}
+                for params in variants.values():
+                    for request in collect_tex(_variant_class(_scene_class, params)):
+                        expression, environment, tex_template = request
+                        requests.setdefault((expression, environment, id(tex_template)), request)
+            print(f"[tex] {prewarm(list(requests.values()))} strings compiled for {len(variants)} variants")
+        apply_renderer(_scene_class, job.settings)
+        if hasattr(_scene_class, "shared_setup"):
+            _scene_class.shared_setup()
+
+
+def render_variant(job, name, params):
+    """Fork entry point. Renders one variant and returns (name, video path, error)."""
+    from manim import tempconfig
+
+    # The variants share the scene's name, so each needs its own partial movie folder as well
+    settings = dict(
+        job.settings,
+        input_file=str(job.path),
+        output_file=f"{job.scene}_{name}",
+        partial_movie_dir="{video_dir}/partial_movie_files/{scene_name}/" + name,
+    )
+    try:
+        with tempconfig(settings):
+            apply_renderer(_scene_class, job.settings)
+            scene = _variant_class(_scene_class, params)()
+            scene.render()
+            return name, str(scene.renderer.file_writer.movie_file_path), None
+    except Exception:
+        return name, None, traceback.format_exc()
+
+
+def _render_variant(task):
+    return render_variant(*task)
+
+
+def render_variants(job, variants, workers=None):
+    """Warms up once, then renders every variant in its own fork. Returns the names that failed."""
+    warm_up(job, variants)
+    # Objects built so far are never collected, so the forks keep sharing their pages
+    gc.freeze()
+    failed = []
+    try:
+        # One task per child: every variant starts from the warm state, not from another variant's leftovers
+        with get_context("fork").Pool(workers or os.cpu_count(), maxtasksperchild=1) as pool:
+            tasks = [(job, name, params) for name, params in variants.items()]
+            for name, output, error in pool.imap_unordered(_render_variant, tasks):
+                if error:
+                    print(f"[fail] {name}\n{error}", file=sys.stderr)
+                    failed.append(name)
+                else:
+                    print(f"[done] {name} -> {output}")
+    finally:
+        gc.unfreeze()
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render parametrized variants of a scene from one warm process.")
+    parser.add_argument("file", help="scene file, e.g. bubble_sort_final_layout.py")
+    parser.add_argument("scene", help="scene class, e.g. BubbleSortWithCodeScene")
+    parser.add_argument("variants", nargs="?", type=Path, help="JSON file mapping variant names to class attributes")
+    parser.add_argument("--sort-inputs", action="store_true", help="render the numbers, their worst case and shuffles")
+    parser.add_argument("--numbers", help="comma-separated numbers for --sort-inputs (default: the scene's own)")
+    parser.add_argument("--permutations", type=int, default=3, help="random shuffles for --sort-inputs (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="concurrent forks (default: all cores)")
+    parser.add_argument("--media-dir", default=str(REPO_ROOT / "media"))
+    args = parser.parse_args(argv)
+    if args.variants is None and not args.sort_inputs:
+        parser.error("give a variants file or --sort-inputs")
+
+    variants = {}
+    if args.variants is not None:
+        variants.update(json.loads(args.variants.read_text(encoding="utf-8")))
+    if args.sort_inputs:
+        if args.numbers:
+            numbers = [int(number) for number in args.numbers.split(",")]
+        else:
+            numbers = getattr(load_module(Path(args.file).resolve()), args.scene).numbers
+        variants.update(sort_variants(numbers, args.permutations, args.seed))
+
+    settings = {"quality": QUALITIES[args.quality], "media_dir": args.media_dir}
+    job = SceneJob(Path(args.file).resolve(), args.scene, settings)
+    job = calibrated([job], Path(args.media_dir) / CALIBRATION)[0]
+    failed = render_variants(job, variants, args.jobs)
+    if failed:
+        print(f"{len(failed)} variant(s) failed: {', '.join(sorted(failed))}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())